@@ -6,14 +6,18 @@ https://github.com/andrew-codechimp/HA-Mealie
 
 from __future__ import annotations
 
+import time
+
 from awesomeversion.awesomeversion import AwesomeVersion
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
+from homeassistant.loader import async_get_integration
 from homeassistant.helpers import config_validation as cv
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.const import __version__ as HA_VERSION  # noqa: N812
@@ -27,18 +31,38 @@ from .const import (
     DOMAIN,
     LOGGER,
     MIN_HA_VERSION,
+    IMPORT_STARTED,
+    STARTUP_BUDGET,
     DOMAIN_CONFIG,
     COORDINATOR,
+    STORAGE_VERSION,
     CONF_BREAKFAST_START,
     CONF_BREAKFAST_END,
     CONF_LUNCH_START,
     CONF_LUNCH_END,
     CONF_DINNER_START,
     CONF_DINNER_END,
+    CONF_MEAL_PLAN_DAYS_BEFORE,
+    CONF_MEAL_PLAN_DAYS_AFTER,
+    CONF_MEAL_DAY_OFFSETS,
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    CONF_IMAGE_VARIANT,
+    CONF_IMAGE_VARIANTS,
+    CONF_IMAGE_MAX_WIDTH,
+    CONF_RECORD,
+    IMAGE_VARIANTS,
+    DEFAULT_IMAGE_VARIANT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
 )
 
 from .api import MealieApiClient
+from .capabilities import ServerCapabilities
 from .coordinator import MealieDataUpdateCoordinator
+from .services import async_setup_services
+
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
 
 PLATFORMS: list[Platform] = [
     Platform.TODO,
@@ -58,6 +82,29 @@ CONFIG_SCHEMA = vol.Schema(
                     vol.Optional(CONF_LUNCH_END, default="14:00"): cv.string,
                     vol.Optional(CONF_DINNER_START, default="16:00"): cv.string,
                     vol.Optional(CONF_DINNER_END, default="21:00"): cv.string,
+                    vol.Optional(
+                        CONF_MEAL_PLAN_DAYS_BEFORE, default=7
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_MEAL_PLAN_DAYS_AFTER, default=30
+                    ): cv.positive_int,
+                    vol.Optional(CONF_MEAL_DAY_OFFSETS, default=[1]): vol.All(
+                        cv.ensure_list, [vol.All(vol.Coerce(int), vol.Range(min=1))]
+                    ),
+                    vol.Optional(
+                        CONF_RATE_LIMIT, default=DEFAULT_RATE_LIMIT
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0.1)),
+                    vol.Optional(
+                        CONF_RATE_LIMIT_BURST, default=DEFAULT_RATE_LIMIT_BURST
+                    ): cv.positive_int,
+                    vol.Optional(
+                        CONF_IMAGE_VARIANT, default=DEFAULT_IMAGE_VARIANT
+                    ): vol.In(IMAGE_VARIANTS),
+                    vol.Optional(CONF_IMAGE_VARIANTS, default={}): {
+                        cv.string: vol.In(IMAGE_VARIANTS)
+                    },
+                    vol.Optional(CONF_IMAGE_MAX_WIDTH): cv.positive_int,
+                    vol.Optional(CONF_RECORD): cv.string,
                 },
             ),
         ),
@@ -93,17 +140,27 @@ async def async_setup(
         CONF_LUNCH_END: "14:00",
         CONF_DINNER_START: "16:00",
         CONF_DINNER_END: "21:00",
+        CONF_MEAL_PLAN_DAYS_BEFORE: 7,
+        CONF_MEAL_PLAN_DAYS_AFTER: 30,
+        CONF_MEAL_DAY_OFFSETS: [1],
+        CONF_RATE_LIMIT: DEFAULT_RATE_LIMIT,
+        CONF_RATE_LIMIT_BURST: DEFAULT_RATE_LIMIT_BURST,
+        CONF_IMAGE_VARIANT: DEFAULT_IMAGE_VARIANT,
+        CONF_IMAGE_VARIANTS: {},
     }
 
     hass.data[DOMAIN] = {
         DOMAIN_CONFIG: domain_config,
     }
 
+    async_setup_services(hass)
+
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
+    setup_started = time.perf_counter()
 
     session = async_get_clientsession(hass)
 
@@ -113,30 +170,112 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if entry.data[CONF_HOST] == "" or entry.data[CONF_TOKEN] == "":
         raise ConfigEntryAuthFailed("Unable to login, please re-login.") from None
 
-    api = MealieApiClient(
-        host=entry.data[CONF_HOST],
-        token=entry.data[CONF_TOKEN],
-        session=session,
+    domain_config = hass.data[DOMAIN][DOMAIN_CONFIG]
+
+    try:
+        api = MealieApiClient(
+            host=entry.data[CONF_HOST],
+            token=entry.data[CONF_TOKEN],
+            session=session,
+            rate_limit=domain_config[CONF_RATE_LIMIT],
+            rate_limit_burst=domain_config[CONF_RATE_LIMIT_BURST],
+            record=CONF_RECORD in domain_config,
+        )
+    except ValueError as exception:
+        raise ConfigEntryAuthFailed(exception) from exception
+
+    # Kept in a store rather than the entry, as updating the entry reloads it
+    capabilities_store: Store = Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.capabilities"
     )
+    cached_capabilities = await capabilities_store.async_load()
+
+    async def _async_probe_capabilities() -> None:
+        """Probe what the server supports, storing it if changed."""
+        capabilities = await api.async_probe_capabilities(cached_capabilities)
+        if capabilities is not None and capabilities.as_dict() != cached_capabilities:
+            await capabilities_store.async_save(capabilities.as_dict())
+
+    # Cached capabilities are used straight away, so setup does not wait on the
+    # server, and probed again in the background. Only a first setup waits.
+    if cached_capabilities:
+        api.set_capabilities(ServerCapabilities.from_dict(cached_capabilities))
+        entry.async_create_background_task(
+            hass, _async_probe_capabilities(), f"{DOMAIN} capabilities probe"
+        )
+    else:
+        await _async_probe_capabilities()
+
+    integration = await async_get_integration(hass, DOMAIN)
 
     hass.data[DOMAIN][COORDINATOR] = coordinator = MealieDataUpdateCoordinator(
-        hass=hass, api=api
+        hass=hass, api=api, version=str(integration.version)
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    refresh_started = time.perf_counter()
+    if await coordinator.async_load_snapshot():
+        # Come up with the last good data and replace it in the background
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} initial refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+    refresh_seconds = time.perf_counter() - refresh_started
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if api.recorder is not None:
+        _async_setup_recording(hass, entry, api, domain_config[CONF_RECORD])
+
+    coordinator.startup_timings = {
+        "import_seconds": IMPORT_SECONDS,
+        "first_refresh_seconds": refresh_seconds,
+        "setup_seconds": time.perf_counter() - setup_started,
+        "budget_seconds": STARTUP_BUDGET,
+    }
+    if coordinator.startup_timings["setup_seconds"] > STARTUP_BUDGET:
+        LOGGER.warning(
+            "Setting up Mealie took %.1f seconds, over its %s second budget",
+            coordinator.startup_timings["setup_seconds"],
+            STARTUP_BUDGET,
+        )
 
     return True
 
 
+@callback
+def _async_setup_recording(
+    hass: HomeAssistant, entry: ConfigEntry, api: MealieApiClient, name: str
+) -> None:
+    """Write the recorded API exchanges as a fixture on unload and on stop."""
+    path = hass.config.path(name)
+
+    async def _async_save(*_) -> None:
+        await hass.async_add_executor_job(api.recorder.save, path)
+        LOGGER.info(
+            "Recorded %s Mealie API exchanges to %s", len(api.recorder), path
+        )
+
+    entry.async_on_unload(_async_save)
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_save)
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle removal of an entry, discarding the persisted data."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(
+        hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.capabilities"
+    ).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
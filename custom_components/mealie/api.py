@@ -1,21 +1,139 @@
 """Mealie API Client."""
 
 import aiohttp
+import time
+from collections.abc import Callable
 from asyncio import timeout
-
-from .const import LOGGER
+from yarl import URL
+
+from .const import (
+    LOGGER,
+    DEFAULT_IMAGE_VARIANT,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT_BURST,
+)
+from .capabilities import ServerCapabilities, capabilities_for_version
+from .endpoints import Endpoint, EndpointRegistry, base_url
+from .recording import ApiRecorder
+from .rate_limit import (
+    RateLimiter,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    PRIORITY_PREFETCH,
+)
 
 HEADERS = {"Content-type": "application/json; charset=UTF-8"}
 
+ALL_PARAMS = {"perPage": "-1"}
+MEAL_PLAN_PARAMS = {"orderBy": "date", "orderDirection": "asc", "perPage": "-1"}
+
+
+def _reorder_data(shopping_list_id: str, item: dict, position: int) -> dict:
+    """Return the data to update a shopping list item position."""
+
+    data = {}
+    data["shoppingListId"] = shopping_list_id
+    data["position"] = position
+    data["isFood"] = item["isFood"]
+    data["quantity"] = item["quantity"]
+    data["labelId"] = item["labelId"]
+    data["note"] = item["note"]
+    data["checked"] = item["checked"]
+
+    if item["isFood"]:
+        data["foodId"] = item["foodId"]
+        data["unitId"] = item["unitId"]
+
+    return data
+
+
+class MealieApiError(Exception):
+    """A request to Mealie failed."""
+
+
+class MealieAuthError(MealieApiError):
+    """Mealie refused the token."""
+
+
+class MealieTransientError(MealieApiError):
+    """Mealie could not be reached or failed in a way it may recover from."""
+
+
+def _api_error(status: int | str, exception: Exception | None) -> MealieApiError:
+    """Return the error of a failed request, telling auth from transient failures.
+
+    Only 401 and 403 mean the token is bad. Timeouts, connection and DNS
+    failures, rate limiting and server errors are expected to pass.
+    """
+    if status in (401, 403):
+        return MealieAuthError(f"Mealie refused the token ({status})")
+    if (
+        isinstance(exception, TimeoutError | aiohttp.ClientConnectionError)
+        or status == "no_connection"
+        or status == 429
+        or (isinstance(status, int) and status >= 500)
+    ):
+        return MealieTransientError(f"Mealie is unavailable ({status})")
+    return MealieApiError(f"Mealie request failed ({status})")
+
+
+def returned_items(result: dict | None, key: str) -> list[dict] | None:
+    """Return the items a shopping list write returned, if any.
+
+    Writes return a collection of created, updated and deleted items, or
+    the single item written on older servers.
+    """
+    if isinstance(result, dict):
+        if isinstance(result.get(key), list):
+            return result[key]
+        if "id" in result:
+            return [result]
+    return None
+
+
+def returned_changes(result: dict | None) -> tuple[list[dict], list[str]] | None:
+    """Return the items a shopping list write changed and the ids it deleted.
+
+    Creating items can merge them into those already on the list, which are
+    returned as updated, and the items merged away as deleted.
+    """
+    if isinstance(result, dict) and any(
+        isinstance(result.get(key), list)
+        for key in ("createdItems", "updatedItems", "deletedItems")
+    ):
+        return (
+            [*(result.get("createdItems") or []), *(result.get("updatedItems") or [])],
+            [item["id"] for item in result.get("deletedItems") or []],
+        )
+    if (items := returned_items(result, "createdItems")) is not None:
+        return items, []
+    return None
+
 
 class MealieApiClient:
     """API for Mealie."""
 
-    def __init__(self, host: str, token: str, session: aiohttp.ClientSession) -> None:
-        """Initialize."""
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        session: aiohttp.ClientSession,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_limit_burst: int = DEFAULT_RATE_LIMIT_BURST,
+        record: bool = False,
+    ) -> None:
+        """Initialize, raising ValueError if the host is not a valid address.
+
+        When recording, exchanges with the server are kept in recorder to be
+        written as a fixture.
+        """
         self._host = host
+        self._urls = EndpointRegistry(base_url(host))
         self._token = token
         self._session = session
+        self.rate_limiter = RateLimiter(rate_limit, rate_limit_burst)
+        self.capabilities = ServerCapabilities()
+        self.recorder = ApiRecorder(self._urls.base) if record else None
 
         self._connected = False
         self._error = ""
@@ -25,26 +143,83 @@ class MealieApiClient:
         # headers["Authorization"] = f"bearer {self._token}"
         return {"Authorization": f"bearer {self._token}"}
 
-    async def async_get_groups(self) -> dict:
+    def set_capabilities(self, capabilities: ServerCapabilities) -> None:
+        """Use the endpoints and code paths the server supports."""
+        self.capabilities = capabilities
+        self._urls = EndpointRegistry(self._urls.base, capabilities.households)
+
+    async def async_get_about(self) -> dict:
+        """Get the version and settings of the server."""
+        return await self.api_wrapper("get", self._urls.url(Endpoint.APP_ABOUT))
+
+    async def async_probe_capabilities(
+        self, cached: dict | None = None
+    ) -> ServerCapabilities | None:
+        """Find out what the server supports, using cached capabilities if given.
+
+        The cached capabilities are used as they are unless the server reports
+        a different version, or when it cannot be reached. Return None if the
+        server cannot be reached and nothing is cached, leaving the defaults in
+        use without them having been probed.
+        """
+        capabilities = ServerCapabilities.from_dict(cached) if cached else None
+        about = await self.async_get_about()
+        if self.recorder is not None and about is not None:
+            self.recorder.server_version = about.get("version")
+        if about is None:
+            if capabilities is None:
+                return None
+        elif capabilities is None or capabilities.version != about.get("version"):
+            capabilities = capabilities_for_version(about.get("version"), capabilities)
+            LOGGER.debug("%s capabilities: %s", self._host, capabilities)
+
+        self.set_capabilities(capabilities)
+        return capabilities
+
+    async def async_get_groups(self, raise_errors: bool = False) -> dict:
         """Get current users group."""
-        return await self.api_wrapper("get", "/api/groups/self")
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.GROUPS_SELF), raise_errors=raise_errors
+        )
 
-    async def async_get_shopping_lists(self) -> dict:
+    async def async_get_shopping_lists(self, raise_errors: bool = False) -> dict:
         """Get all shopping lists for our group."""
-        return await self.api_wrapper("get", "/api/groups/shopping/lists")
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.SHOPPING_LISTS), raise_errors=raise_errors
+        )
 
     async def async_get_shopping_list_items(
-        self, shopping_list_id: str
+        self,
+        shopping_list_id: str,
+        updated_since: str | None = None,
+        updated_field: str = "updatedAt",
+        raise_errors: bool = False,
     ) -> dict:
-        """Get all shopping list items."""
+        """Get shopping list items, only those changed since a time if given."""
+
+        query_filter = f"shoppingListId={shopping_list_id}"
+        if updated_since is not None:
+            query_filter += f' AND {updated_field} >= "{updated_since}"'
+        params = {
+            "orderBy": "position",
+            "orderDirection": "asc",
+            "perPage": "-1",
+            "queryFilter": query_filter,
+        }
 
-        params = {"orderBy": "position", "orderDirection": "asc", "perPage": "-1"}
-        params["queryFilter"] = f"shoppingListId={shopping_list_id}"
-
-        return await self.api_wrapper("get", "/api/groups/shopping/items", data=params)
+        return await self.api_wrapper(
+            "get",
+            self._urls.url(Endpoint.SHOPPING_ITEMS),
+            data=params,
+            raise_errors=raise_errors,
+        )
 
     async def async_add_shopping_list_item(
-        self, shopping_list_id: str, summary: str, position: int
+        self,
+        shopping_list_id: str,
+        summary: str,
+        position: int,
+        raise_errors: bool = False,
     ) -> dict:
         """Add a shopping list item."""
 
@@ -53,7 +228,29 @@ class MealieApiClient:
         data["shoppingListId"] = shopping_list_id
         data["position"] = position
 
-        return await self.api_wrapper("post", "/api/groups/shopping/items", data=data)
+        return await self.api_wrapper(
+            "post",
+            self._urls.url(Endpoint.SHOPPING_ITEMS),
+            data=data,
+            raise_errors=raise_errors,
+        )
+
+    async def async_add_shopping_list_items(
+        self, items: list[dict], raise_errors: bool = False
+    ) -> dict:
+        """Add many shopping list items in one request, if the server can."""
+
+        if not self.capabilities.bulk_writes:
+            return await self._async_write_each(
+                "post", Endpoint.SHOPPING_ITEMS, items, "createdItems", raise_errors
+            )
+
+        return await self.api_wrapper(
+            "post",
+            self._urls.url(Endpoint.SHOPPING_ITEMS_CREATE_BULK),
+            data=items,
+            raise_errors=raise_errors,
+        )
 
     async def async_update_shopping_list_item(
         self, shopping_list_id: str, item_id: str, item: dict
@@ -61,71 +258,209 @@ class MealieApiClient:
         """Update a shopping list item."""
 
         return await self.api_wrapper(
-            "put", f"/api/groups/shopping/items/{item_id}", data=item
+            "put", self._urls.url(Endpoint.SHOPPING_ITEM, item_id=item_id), data=item
         )
 
+    async def async_update_shopping_list_items(
+        self, items: list[dict], raise_errors: bool = False
+    ) -> dict:
+        """Update many shopping list items in one request, if the server can."""
+
+        if not self.capabilities.bulk_writes:
+            return await self._async_write_each(
+                "put", Endpoint.SHOPPING_ITEM, items, "updatedItems", raise_errors
+            )
+
+        return await self.api_wrapper(
+            "put",
+            self._urls.url(Endpoint.SHOPPING_ITEMS),
+            data=items,
+            raise_errors=raise_errors,
+        )
+
+    async def _async_write_each(
+        self,
+        method: str,
+        endpoint: Endpoint,
+        items: list[dict],
+        key: str,
+        raise_errors: bool = False,
+    ) -> dict | None:
+        """Write items one request at a time, for servers without bulk writes.
+
+        Items written before one fails are not returned, callers fetch the
+        list again when a write fails.
+        """
+
+        written = []
+        for item in items:
+            if endpoint is Endpoint.SHOPPING_ITEM:
+                url = self._urls.url(endpoint, item_id=item["id"])
+            else:
+                url = self._urls.url(endpoint)
+            result = await self.api_wrapper(
+                method, url, data=item, raise_errors=raise_errors
+            )
+            if result is None:
+                return None
+            written.extend(returned_items(result, key) or [])
+
+        return {key: written}
+
     async def async_reorder_shopping_list_item(
         self, shopping_list_id: str, item: dict, position: int
     ) -> dict:
         """Update a shopping list item position."""
 
-        data = {}
-        data["shoppingListId"] = shopping_list_id
+        data = _reorder_data(shopping_list_id, item, position)
         data["item_id"] = item["id"]
-        data["position"] = position
-        data["isFood"] = item["isFood"]
-        data["quantity"] = item["quantity"]
-        data["labelId"] = item["labelId"]
-        data["note"] = item["note"]
-        data["checked"] = item["checked"]
-
-        if item["isFood"]:
-            data["foodId"] = item["foodId"]
-            data["unitId"] = item["unitId"]
 
         return await self.api_wrapper(
-            "put", f"/api/groups/shopping/items/{item["id"]}", data=data
+            "put", self._urls.url(Endpoint.SHOPPING_ITEM, item_id=item["id"]), data=data
         )
 
-    async def async_delete_shopping_list_item(self, item_id: str) -> dict:
+    async def async_reorder_shopping_list_items(
+        self, shopping_list_id: str, items: list[dict], raise_errors: bool = False
+    ) -> dict:
+        """Update the positions of shopping list items in one request."""
+
+        data = []
+        for position, item in enumerate(items):
+            item_data = _reorder_data(shopping_list_id, item, position)
+            item_data["id"] = item["id"]
+            data.append(item_data)
+
+        return await self.async_update_shopping_list_items(data, raise_errors)
+
+    async def async_delete_shopping_list_item(
+        self, item_id: str, raise_errors: bool = False
+    ) -> dict:
         """Delete a shopping list item."""
 
         data = {}
         data["item_id"] = item_id
 
         return await self.api_wrapper(
-            "delete", f"/api/groups/shopping/items/{item_id}", data=data
+            "delete",
+            self._urls.url(Endpoint.SHOPPING_ITEM, item_id=item_id),
+            data=data,
+            raise_errors=raise_errors,
+        )
+
+    async def async_get_units(self) -> dict:
+        """Get all units."""
+
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.UNITS), data=ALL_PARAMS
+        )
+
+    async def async_get_labels(self) -> dict:
+        """Get all labels for our group."""
+
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.LABELS), data=ALL_PARAMS
         )
 
-    async def async_get_meal_plans(self, start_date: str, end_date: str) -> dict:
+    async def async_get_meal_plans(
+        self, start_date: str, end_date: str, priority: int = PRIORITY_POLL
+    ) -> dict:
         """Get all meal plans for our group."""
-        params = {"orderBy": "date", "orderDirection": "asc", "perPage": "-1"}
-        params["start_date"] = start_date
-        params["end_date"] = end_date
+        params = {**MEAL_PLAN_PARAMS, "start_date": start_date, "end_date": end_date}
+
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.MEAL_PLANS), data=params, priority=priority
+        )
 
-        return await self.api_wrapper("get", "/api/groups/mealplans", data=params)
+    async def async_get_meal_plan(self, meal_plan_id: str) -> dict:
+        """Get a meal plan entry."""
 
-    async def async_get_meal_plans_today(self) -> dict:
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.MEAL_PLAN, meal_plan_id=meal_plan_id)
+        )
+
+    async def async_get_meal_plans_today(self, raise_errors: bool = False) -> dict:
         """Get today's meal plans for our group."""
-        params = {"orderBy": "date", "orderDirection": "asc", "perPage": "-1"}
 
-        return await self.api_wrapper("get", "/api/groups/mealplans/today", data=params)
+        return await self.api_wrapper(
+            "get",
+            self._urls.url(Endpoint.MEAL_PLANS_TODAY),
+            data=MEAL_PLAN_PARAMS,
+            raise_errors=raise_errors,
+        )
+
+    async def async_get_recipe(self, recipe_slug: str) -> dict:
+        """Get a recipe."""
+
+        return await self.api_wrapper(
+            "get", self._urls.url(Endpoint.RECIPE, recipe_slug=recipe_slug)
+        )
+
+    def async_get_recipe_image_url(
+        self,
+        recipe_id: str,
+        variant: str = DEFAULT_IMAGE_VARIANT,
+        version: str | None = None,
+    ) -> str:
+        """Construct a url for a variant of the recipe image."""
+        url = self._urls.url(
+            Endpoint.RECIPE_IMAGE, recipe_id=recipe_id, variant=variant
+        )
+        if version:
+            url = url.with_query(version=version)
+        return str(url)
+
+    async def async_get_image(
+        self, url: str, reserve: Callable[[int], bool] | None = None
+    ) -> bytes | None:
+        """Get the bytes of an image, at prefetch priority.
 
-    def async_get_recipe_image_url(self, recipe_id: str) -> str:
-        """Construct a url for the recipe image."""
-        return self.http_normalize_slashes(f"/api/media/recipes/{recipe_id}/images/min-original.webp")
+        When given, reserve is called with the size the server reports, or 0
+        when it does not, before the image is read, and the image is not read
+        if it returns False.
+        """
+        await self.rate_limiter.acquire(PRIORITY_PREFETCH)
+
+        try:
+            async with timeout(10), self._session.get(url) as response:
+                if response.status == 200 and (
+                    reserve is None or reserve(response.content_length or 0)
+                ):
+                    return await response.read()
+        except Exception:  # pylint: disable=broad-exception-caught
+            LOGGER.debug("%s unable to fetch image %s", self._host, url)
+            return None
+
+        LOGGER.debug("%s did not fetch image %s", self._host, url)
+        return None
 
     def async_get_recipe_url(self, recipe_slug: str) -> str:
         """Construct a url for the recipe."""
-        return self.http_normalize_slashes(f"/g/home/r/{recipe_slug}")
-
-    async def api_wrapper(self, method: str, service: str, data: dict = {}) -> any:
-        """Get information from the API."""
+        return str(self._urls.url(Endpoint.RECIPE_PAGE, recipe_slug=recipe_slug))
+
+    async def api_wrapper(
+        self,
+        method: str,
+        url: URL,
+        data: dict | list = {},
+        priority: int | None = None,
+        raise_errors: bool = False,
+    ) -> any:
+        """Get information from the API.
+
+        Reads are rate limited at polling priority and writes at interactive
+        priority unless a priority is given. A failed request returns None, or
+        raises the MealieApiError telling why when raise_errors is set.
+        """
+
+        if priority is None:
+            priority = PRIORITY_POLL if method == "get" else PRIORITY_INTERACTIVE
+        await self.rate_limiter.acquire(priority)
 
         self._connected = False
         error = False
-
-        url = self.http_normalize_slashes(service)
+        failure = None
+        request = data
+        started = time.perf_counter()
 
         try:
             async with timeout(10):
@@ -140,7 +475,7 @@ class MealieApiClient:
                         data = await response.json()
                         LOGGER.debug(
                             "%s query response: %s",
-                            f"{self._host}{service}",
+                            url,
                             data,
                         )
                     else:
@@ -161,7 +496,7 @@ class MealieApiClient:
                         data = await response.json()
                         LOGGER.debug(
                             "%s query response: %s",
-                            f"{self._host}{service}",
+                            url,
                             data,
                         )
                     else:
@@ -182,7 +517,7 @@ class MealieApiClient:
                         data = await response.json()
                         LOGGER.debug(
                             "%s query response: %s",
-                            f"{self._host}{service}",
+                            url,
                             data,
                         )
                     else:
@@ -199,7 +534,7 @@ class MealieApiClient:
                         data = await response.json()
                         LOGGER.debug(
                             "%s query response: %s",
-                            f"{self._host}{service}",
+                            url,
                             data,
                         )
                     else:
@@ -207,8 +542,9 @@ class MealieApiClient:
 
                 else:
                     error = True
-        except Exception:  # pylint: disable=broad-exception-caught
+        except Exception as exception:  # pylint: disable=broad-exception-caught
             error = True
+            failure = exception
 
         if error:
             try:
@@ -219,35 +555,41 @@ class MealieApiClient:
             LOGGER.warning(
                 "%s unable to fetch data %s (%s)",
                 self._host,
-                service,
+                url.path,
                 errorcode,
             )
 
+            if self.recorder is not None:
+                self.recorder.record(
+                    method,
+                    url,
+                    request,
+                    errorcode,
+                    None,
+                    time.perf_counter() - started,
+                )
+
             self._error = errorcode
+            if raise_errors:
+                raise _api_error(errorcode, failure) from failure
             return None
 
         self._connected = True
         self._error = ""
 
+        if self.recorder is not None:
+            self.recorder.record(
+                method,
+                url,
+                request,
+                response.status,
+                data,
+                time.perf_counter() - started,
+            )
+
         return data
 
     @property
     def error(self):
         """Return error."""
         return self._error
-
-    def http_normalize_slashes(self, service):
-        """Fix slashes between host and service."""
-
-        url = f"{self._host}{service}"
-        segments = url.split("/")
-        correct_segments = []
-        for segment in segments:
-            if segment != "":
-                correct_segments.append(segment)
-        first_segment = str(correct_segments[0])
-        if first_segment.find("http") == -1:
-            correct_segments = ["http:"] + correct_segments
-        correct_segments[0] = correct_segments[0] + "/"
-        normalized_url = "/".join(correct_segments)
-        return normalized_url
@@ -0,0 +1,107 @@
+"""Caches for Mealie data."""
+
+from __future__ import annotations
+
+import io
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .const import LOGGER, CONF_IMAGE_MAX_WIDTH
+
+
+def downscale_image(content: bytes, max_width: int) -> bytes:
+    """Downscale an image to a maximum width, run in an executor."""
+    try:
+        from PIL import Image as PILImage  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        LOGGER.warning("Pillow is not available, %s is ignored", CONF_IMAGE_MAX_WIDTH)
+        return content
+
+    try:
+        with PILImage.open(io.BytesIO(content)) as image:
+            if image.width <= max_width:
+                return content
+
+            image.thumbnail((max_width, image.height))
+            output = io.BytesIO()
+            image.save(output, format="WEBP")
+            return output.getvalue()
+    except OSError as exception:
+        # Truncated or corrupt images are shown as they are
+        LOGGER.debug("Unable to downscale image (%s)", exception)
+        return content
+
+
+class RecipeDetailCache:
+    """Full recipes keyed by slug, refetched when the recipe changes or expires."""
+
+    def __init__(self, ttl: timedelta) -> None:
+        """Initialize."""
+        self._ttl = ttl
+        self._entries: dict[str, tuple[str | None, datetime, dict]] = {}
+        self.version = 0
+
+    def needs_fetch(self, slug: str, date_updated: str | None) -> bool:
+        """Return True if the recipe is missing, changed or expired."""
+        if (entry := self._entries.get(slug)) is None:
+            return True
+
+        cached_date_updated, fetched, _ = entry
+        return (
+            cached_date_updated != date_updated
+            or dt_util.utcnow() - fetched > self._ttl
+        )
+
+    def get(self, slug: str) -> dict | None:
+        """Return a cached recipe."""
+        if (entry := self._entries.get(slug)) is None:
+            return None
+        return entry[2]
+
+    def set(self, slug: str, date_updated: str | None, recipe: dict) -> None:
+        """Cache a recipe, changing the version if it differs."""
+        if (entry := self._entries.get(slug)) is None or entry[2] != recipe:
+            self.version += 1
+        self._entries[slug] = (date_updated, dt_util.utcnow(), recipe)
+
+    def prune(self, slugs: set[str]) -> None:
+        """Drop recipes other than the given ones."""
+        for slug in self._entries.keys() - slugs:
+            del self._entries[slug]
+            self.version += 1
+
+
+class ImageCache:
+    """Image bytes, least recently used evicted beyond a byte budget."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize."""
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._images: OrderedDict[tuple[str, int | None], bytes] = OrderedDict()
+
+    def get(self, url: str, max_width: int | None = None) -> bytes | None:
+        """Return cached image bytes."""
+        key = (url, max_width)
+        if (content := self._images.get(key)) is not None:
+            self._images.move_to_end(key)
+        return content
+
+    def has(self, url: str, max_width: int | None = None) -> bool:
+        """Return True if the image is cached."""
+        return (url, max_width) in self._images
+
+    def set(self, url: str, max_width: int | None, content: bytes) -> None:
+        """Cache image bytes."""
+        key = (url, max_width)
+        if (previous := self._images.pop(key, None)) is not None:
+            self._size -= len(previous)
+
+        self._images[key] = content
+        self._size += len(content)
+
+        while self._size > self._max_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._size -= len(evicted)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
 from homeassistant.components.calendar import (
     CalendarEntity,
@@ -27,10 +28,24 @@ from .const import (
 )
 
 from .entity import MealieEntity
-from .coordinator import MealieDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
 
 SCAN_INTERVAL = timedelta(minutes=1)
 
+
+def _event(start: datetime, end: datetime, plan: dict) -> CalendarEvent:
+    """Return the calendar event of a meal plan."""
+
+    if plan["recipeId"]:
+        summary = plan["recipe"]["name"]
+    else:
+        summary = plan["title"]
+
+    return CalendarEvent(start=start, end=end, summary=summary, uid=plan["id"])
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
@@ -105,21 +120,15 @@ class MealieCalendarEntity(
 
     @property
     def event(self) -> CalendarEvent | None:
-        """Return the next upcoming event."""
+        """Return the current or next upcoming event."""
 
-        if self.breakfast_start <= dt_util.now() <= self.breakfast_end:
-            if self.coordinator.todays_breakfast():
-                return CalendarEvent(start=self.breakfast_start, end=self.breakfast_end, summary=self.coordinator.todays_breakfast())
-
-        if self.lunch_start <= dt_util.now() <= self.lunch_end:
-            if self.coordinator.todays_lunch():
-                return CalendarEvent(start=self.lunch_start, end=self.lunch_end, summary=self.coordinator.todays_lunch())
+        now = dt_util.now()
+        index = self.coordinator.meal_plan_index
 
-        if self.dinner_start <= dt_util.now() <= self.dinner_end:
-            if self.coordinator.todays_dinner():
-                return CalendarEvent(start=self.dinner_start, end=self.dinner_end, summary=self.coordinator.todays_dinner())
+        if (entry := index.current(now) or index.next(now)) is None:
+            return None
 
-        return None
+        return _event(entry.start, entry.end, entry.plan)
 
     @property
     def state(self) -> str:
@@ -146,6 +155,18 @@ class MealieCalendarEntity(
     ) -> list[CalendarEvent]:
         """Get all events in a specific time frame."""
 
+        if (window := self.coordinator.meal_plan_window) is not None and (
+            window[0] <= start_date.date() and end_date.date() <= window[1]
+        ):
+            # Whole days are looked up, as a meal can start before start_date
+            day_start = dt_util.start_of_local_day(start_date)
+            day_end = dt_util.start_of_local_day(end_date) + timedelta(days=1)
+            return [
+                _event(entry.start, entry.end, entry.plan)
+                for entry in self.coordinator.meal_plan_index.range(day_start, day_end)
+                if entry.end > start_date and entry.start < end_date
+            ]
+
         mealie_start_date = f"{start_date:%Y-%m-%d}"
         mealie_end_date = f"{end_date:%Y-%m-%d}"
 
@@ -177,25 +198,6 @@ class MealieCalendarEntity(
             start = start.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
             end = end.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
 
-            # start = start.replace(tzinfo=dt_util.get_time_zone(self.hass.config.time_zone))
-            # end = end.replace(tzinfo=dt_util.get_time_zone(self.hass.config.time_zone))
-
-            # start_utc = dt_util.as_utc(start)
-            # end_utc = dt_util.as_utc(end)
-
-            # start_utc = start_utc.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-            # end_utc = end_utc.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
-
-            # start = start.replace(tzinfo=dt_util.get_time_zone(self.hass.config.time_zone))
-            # end = end.replace(tzinfo=dt_util.get_time_zone(self.hass.config.time_zone))
-
-            if plan["recipeId"]:
-                summary = plan["recipe"]["name"]
-            else:
-                summary = plan["title"]
-
-            event = CalendarEvent(start=start, end=end, summary=summary, uid=plan["id"])
-
-            events.append(event)
+            events.append(_event(start, end, plan))
 
         return events
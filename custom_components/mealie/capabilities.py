@@ -0,0 +1,60 @@
+"""What a Mealie server supports, by its version."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, replace
+
+from awesomeversion import AwesomeVersion
+from awesomeversion.exceptions import AwesomeVersionException
+
+# The first release supporting each capability
+BULK_WRITES_VERSION = "1.0.0"
+QUERY_FILTER_VERSION = "1.0.0"
+HOUSEHOLDS_VERSION = "2.0.0"
+
+
+@dataclass(frozen=True)
+class ServerCapabilities:
+    """Capabilities of a Mealie server."""
+
+    version: str | None = None
+    bulk_writes: bool = True
+    query_filter: bool = True
+    households: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ServerCapabilities:
+        """Return the capabilities stored in a config entry."""
+        return cls(**{key: data[key] for key in asdict(cls()) if key in data})
+
+    def as_dict(self) -> dict:
+        """Return the capabilities to store in a config entry."""
+        return asdict(self)
+
+
+def capabilities_for_version(
+    version: str | None, fallback: ServerCapabilities | None = None
+) -> ServerCapabilities:
+    """Return the capabilities of a Mealie version.
+
+    Builds that are not a release, such as nightly, keep the fallback given,
+    or else what every 1.x release supports, and servers that did not say
+    which version they are only what every version supports.
+    """
+    if not version:
+        return ServerCapabilities(
+            version=version, bulk_writes=False, query_filter=False
+        )
+
+    try:
+        parsed = AwesomeVersion(version.removeprefix("v"))
+        return ServerCapabilities(
+            version=version,
+            bulk_writes=parsed >= BULK_WRITES_VERSION,
+            query_filter=parsed >= QUERY_FILTER_VERSION,
+            households=parsed >= HOUSEHOLDS_VERSION,
+        )
+    except AwesomeVersionException:
+        if fallback is not None:
+            return replace(fallback, version=version)
+        return ServerCapabilities(version=version)
@@ -14,7 +14,12 @@ from homeassistant.const import (
     CONF_TOKEN,
 )
 
-from .api import MealieApiClient
+from .api import (
+    MealieApiClient,
+    MealieApiError,
+    MealieAuthError,
+    MealieTransientError,
+)
 
 from .const import (
     DOMAIN,
@@ -50,17 +55,26 @@ class MealieConfigFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 return self.async_abort(reason="single_instance_allowed")
 
         if user_input is not None:
-            api = MealieApiClient(
-                user_input[CONF_HOST],
-                user_input[CONF_TOKEN],
-                async_get_clientsession(self.hass),
-            )
-
-            await api.async_get_groups()
-
-            if api.error:
-                errors["base"] = api.error
-                LOGGER.error("Mealie connection error (%s)", api.error)
+            try:
+                api = MealieApiClient(
+                    user_input[CONF_HOST],
+                    user_input[CONF_TOKEN],
+                    async_get_clientsession(self.hass),
+                )
+            except ValueError:
+                errors[CONF_HOST] = "invalid_host"
+            else:
+                try:
+                    await api.async_get_groups(raise_errors=True)
+                except MealieAuthError:
+                    errors["base"] = "401"
+                except MealieTransientError:
+                    errors["base"] = "no_connection"
+                except MealieApiError:
+                    errors["base"] = "unknown"
+
+                if errors:
+                    LOGGER.error("Mealie connection error (%s)", api.error)
 
             # Save instance
             if not errors:
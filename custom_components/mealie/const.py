@@ -1,21 +1,19 @@
 """Constants for mealie."""
 
-import json
+import time
+from datetime import timedelta
 from logging import Logger, getLogger
-from pathlib import Path
+
+# Taken first so the integration can report how long its modules took to import
+IMPORT_STARTED = time.perf_counter()
 
 LOGGER: Logger = getLogger(__package__)
 
 MIN_HA_VERSION = "2024.3"
 
-manifestfile = Path(__file__).parent / "manifest.json"
-with open(file=manifestfile, encoding="UTF-8") as json_file:
-    manifest_data = json.load(json_file)
-
-DOMAIN = manifest_data.get("domain")
-NAME = manifest_data.get("name")
-VERSION = manifest_data.get("version")
-ISSUEURL = manifest_data.get("issue_tracker")
+DOMAIN = "mealie"
+NAME = "Mealie"
+ISSUEURL = "https://github.com/andrew-codechimp/HA-Mealie/issues"
 MANUFACTURER = "@Andrew-CodeChimp"
 
 DOMAIN_CONFIG = "config"
@@ -23,6 +21,35 @@ COORDINATOR = "coordinator"
 MEALIE_LOGO = "mealie.png"
 
 SERVICE_ADD_SHOPPING_LIST_ITEM = "add_shopping_list_item"
+SERVICE_ADD_SHOPPING_LIST_ITEM_IF_MISSING = "add_shopping_list_item_if_missing"
+SERVICE_CHECK_ALL_ITEMS = "check_all_items"
+SERVICE_UNCHECK_ALL_ITEMS = "uncheck_all_items"
+SERVICE_ADD_RECIPE_TO_SHOPPING_LIST = "add_recipe_to_shopping_list"
+SERVICE_PROFILE = "profile"
+
+STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30
+WRITE_QUEUE_DELAY = 1.5
+REFRESH_DEADLINE = 8
+UPDATE_INTERVAL = timedelta(seconds=10)
+BACKOFF_MAX_INTERVAL = timedelta(minutes=5)
+STARTUP_BUDGET = 10
+SHOPPING_LIST_RECONCILE_INTERVAL = timedelta(minutes=5)
+RECIPE_CACHE_TTL = timedelta(hours=12)
+IMAGE_CACHE_MAX_BYTES = 8 * 1024 * 1024
+IMAGE_PREFETCH_INTERVAL = timedelta(minutes=30)
+IMAGE_PREFETCH_CONCURRENCY = 2
+IMAGE_PREFETCH_MAX_BYTES = 4 * 1024 * 1024
+
+MEAL_PLAN_INDEX_INTERVAL = timedelta(minutes=15)
+
+DEFAULT_RATE_LIMIT = 10
+DEFAULT_RATE_LIMIT_BURST = 20
+
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "side"]
+
+IMAGE_VARIANTS = ["tiny-original", "min-original", "original"]
+DEFAULT_IMAGE_VARIANT = "min-original"
 
 CONF_BREAKFAST_START = "breakfast_start"
 CONF_BREAKFAST_END = "breakfast_end"
@@ -30,6 +57,35 @@ CONF_LUNCH_START = "lunch_start"
 CONF_LUNCH_END = "lunch_end"
 CONF_DINNER_START = "dinner_start"
 CONF_DINNER_END = "dinner_end"
+CONF_MEAL_PLAN_DAYS_BEFORE = "meal_plan_days_before"
+CONF_MEAL_PLAN_DAYS_AFTER = "meal_plan_days_after"
+CONF_MEAL_DAY_OFFSETS = "meal_day_offsets"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_RATE_LIMIT_BURST = "rate_limit_burst"
+CONF_IMAGE_VARIANT = "image_variant"
+CONF_IMAGE_VARIANTS = "image_variants"
+CONF_IMAGE_MAX_WIDTH = "image_max_width"
+CONF_RECORD = "record"
 
 ATTR_SHOPPING_LIST_ID = "shopping_list_id"
+ATTR_ITEM = "item"
+ATTR_ITEMS = "items"
+ATTR_NOTE = "note"
+ATTR_QUANTITY = "quantity"
+ATTR_UNIT = "unit"
+ATTR_LABEL = "label"
+ATTR_RECIPE_SLUG = "recipe_slug"
+ATTR_MEAL_PLAN_ID = "meal_plan_id"
+ATTR_FOOD_ID = "food_id"
+ATTR_ADDED = "added"
+ATTR_ITEM_ID = "item_id"
 ATTR_RECIPE_URL = "recipe_url"
+ATTR_STALE = "stale"
+ATTR_DURATION = "duration"
+ATTR_PATH = "path"
+ATTR_DESCRIPTION = "description"
+ATTR_INGREDIENTS = "ingredients"
+ATTR_PREP_TIME = "prep_time"
+ATTR_COOK_TIME = "cook_time"
+ATTR_TOTAL_TIME = "total_time"
+ATTR_SERVINGS = "servings"
@@ -2,19 +2,64 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import asyncio
+from collections.abc import Awaitable
+from datetime import date, datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
 
-from .api import MealieApiClient
-from .const import DOMAIN, LOGGER
+from .api import MealieApiClient, MealieApiError, MealieAuthError, returned_changes
+from .cache import ImageCache, RecipeDetailCache, downscale_image
+from .list_stats import UncheckedItemCounts
+from .meal_plan_index import MealPlanIndex
+from .merge import UncheckedItemIndex, item_keys
+from .write_queue import ShoppingListWriteQueue
+from .const import (
+    DOMAIN,
+    DOMAIN_CONFIG,
+    LOGGER,
+    STORAGE_VERSION,
+    SNAPSHOT_SAVE_DELAY,
+    REFRESH_DEADLINE,
+    UPDATE_INTERVAL,
+    BACKOFF_MAX_INTERVAL,
+    SHOPPING_LIST_RECONCILE_INTERVAL,
+    RECIPE_CACHE_TTL,
+    IMAGE_CACHE_MAX_BYTES,
+    MEAL_PLAN_INDEX_INTERVAL,
+    IMAGE_PREFETCH_INTERVAL,
+    IMAGE_PREFETCH_CONCURRENCY,
+    IMAGE_PREFETCH_MAX_BYTES,
+    DEFAULT_IMAGE_VARIANT,
+    CONF_BREAKFAST_START,
+    CONF_BREAKFAST_END,
+    CONF_LUNCH_START,
+    CONF_LUNCH_END,
+    CONF_DINNER_START,
+    CONF_DINNER_END,
+    CONF_MEAL_PLAN_DAYS_BEFORE,
+    CONF_MEAL_PLAN_DAYS_AFTER,
+    CONF_MEAL_DAY_OFFSETS,
+    CONF_IMAGE_VARIANT,
+    CONF_IMAGE_VARIANTS,
+    CONF_IMAGE_MAX_WIDTH,
+    ATTR_DESCRIPTION,
+    ATTR_INGREDIENTS,
+    ATTR_PREP_TIME,
+    ATTR_COOK_TIME,
+    ATTR_TOTAL_TIME,
+    ATTR_SERVINGS,
+)
 
 
 class MealieDataUpdateCoordinator(DataUpdateCoordinator):
@@ -26,13 +71,66 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         api: MealieApiClient,
+        version: str,
     ) -> None:
         """Initialize."""
         self.api = api
+        self.version = version
+        self.startup_timings: dict[str, float] = {}
 
         self._shopping_lists: dict | None = None
+        self._shopping_lists_fetched = False
+        self._snapshot_changed = False
+        self._snapshot_save_unsub: CALLBACK_TYPE | None = None
         self.shopping_list_items: dict = {}
+        self._write_queues: dict[str, ShoppingListWriteQueue] = {}
+        self._shopping_list_locks: dict[str, asyncio.Lock] = {}
+        self._shopping_list_versions: dict[str, int] = {}
+        self._shopping_list_watermarks: dict[str, tuple[str, str]] = {}
+        self._shopping_list_reconciled: dict[str, datetime] = {}
+        self._shopping_list_indexes: dict[str, UncheckedItemIndex] = {}
+        self.shopping_list_counts: dict[str, UncheckedItemCounts] = {}
+        self._unit_ids: dict[str, str] | None = None
+        self._label_ids: dict[str, str] | None = None
+        self._labels: list[dict] | None = None
         self.meal_plan: dict = {}
+        self._meal_plan_version = 0
+
+        domain_config = hass.data[DOMAIN][DOMAIN_CONFIG]
+        self.meal_plan_index = MealPlanIndex(
+            {
+                "breakfast": (
+                    domain_config[CONF_BREAKFAST_START],
+                    domain_config[CONF_BREAKFAST_END],
+                ),
+                "lunch": (
+                    domain_config[CONF_LUNCH_START],
+                    domain_config[CONF_LUNCH_END],
+                ),
+                "dinner": (
+                    domain_config[CONF_DINNER_START],
+                    domain_config[CONF_DINNER_END],
+                ),
+            },
+            "dinner",
+        )
+        self._meal_plan_days_before = domain_config[CONF_MEAL_PLAN_DAYS_BEFORE]
+        self._meal_plan_days_after = domain_config[CONF_MEAL_PLAN_DAYS_AFTER]
+        if max(domain_config[CONF_MEAL_DAY_OFFSETS], default=0) > (
+            self._meal_plan_days_after
+        ):
+            LOGGER.warning(
+                "%s beyond %s will have no meals",
+                CONF_MEAL_DAY_OFFSETS,
+                CONF_MEAL_PLAN_DAYS_AFTER,
+            )
+        self.meal_plan_window: tuple[date, date] | None = None
+        self._meal_images: dict[tuple, tuple[str | None, datetime | None]] = {}
+        self._last_meal_plan_index_refresh: datetime | None = None
+        self._recipes = RecipeDetailCache(RECIPE_CACHE_TTL)
+        self.images = ImageCache(IMAGE_CACHE_MAX_BYTES)
+        self._last_image_prefetch: datetime | None = None
+        self._image_prefetch_task: asyncio.Task | None = None
         self.last_breakfast_image = None
         self.last_breakfast_image_update = None
         self.last_lunch_image = None
@@ -41,13 +139,72 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
         self.last_dinner_image_update: datetime | None = None
         self.last_side_image: datetime | None = None
         self.last_side_image_update: datetime | None = None
+        self.stale = False
+        self.stale_shopping_lists: set[str] = set()
+        self.consecutive_failures = 0
 
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=10),
+            update_interval=UPDATE_INTERVAL,
+        )
+
+        self._store: Store = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{self.config_entry.entry_id}"
         )
+        self.config_entry.async_on_unload(
+            hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_save_snapshot
+            )
+        )
+
+    async def async_load_snapshot(self) -> bool:
+        """Load the last good data persisted, return True if there was any."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+
+        self.meal_plan = snapshot.get("meal_plan", {})
+        self._meal_plan_version += 1
+        # Only seeds the entities, the catalog is fetched again on the first
+        # refresh to pick up lists created or deleted since
+        self._shopping_lists = snapshot.get("shopping_lists")
+        self.shopping_list_items = snapshot.get("shopping_list_items", {})
+        for shopping_list_id, items in self.shopping_list_items.items():
+            self._index_shopping_list_items(shopping_list_id, items)
+        self.stale = True
+
+        return True
+
+    @callback
+    def _async_schedule_snapshot_save(self) -> None:
+        """Save the snapshot soon if the data changed.
+
+        A save already scheduled is not put off by later changes, so the
+        snapshot keeps up with a refresh interval shorter than the delay.
+        """
+        if self._snapshot_changed and self._snapshot_save_unsub is None:
+            self._snapshot_save_unsub = async_call_later(
+                self.hass, SNAPSHOT_SAVE_DELAY, self._async_save_snapshot
+            )
+
+    async def _async_save_snapshot(self, *_) -> None:
+        """Save the snapshot, if the data changed since it was last saved."""
+        if self._snapshot_save_unsub is not None:
+            self._snapshot_save_unsub()
+            self._snapshot_save_unsub = None
+        if self._snapshot_changed:
+            self._snapshot_changed = False
+            await self._store.async_save(self._snapshot_data())
+
+    def _snapshot_data(self) -> dict:
+        """Return the data to persist."""
+        return {
+            "meal_plan": self.meal_plan,
+            "shopping_lists": self._shopping_lists,
+            "shopping_list_items": self.shopping_list_items,
+        }
 
     def todays_breakfast(self) -> str | None:
         """Return today's breakfast."""
@@ -93,13 +250,17 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
                         return plan["title"]
         return None
 
-    def todays_breakfast_image(self) -> str | None:
+    def todays_breakfast_image(
+        self, variant: str = DEFAULT_IMAGE_VARIANT
+    ) -> str | None:
         """Return today's breakfast image."""
         if self.meal_plan:
             for plan in self.meal_plan:
                 if plan.get("entryType") == "breakfast":
                     if plan["recipeId"] and plan["recipe"]["image"]:
-                        url = self.api.async_get_recipe_image_url(plan["recipeId"])
+                        url = self.api.async_get_recipe_image_url(
+                            plan["recipeId"], variant, plan["recipe"].get("image")
+                        )
                         if url != self.last_breakfast_image:
                             self.last_breakfast_image = url
                             self.last_breakfast_image_update = dt_util.now()
@@ -109,13 +270,17 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
             self.last_breakfast_image_update = None
         return None
 
-    def todays_lunch_image(self) -> str | None:
+    def todays_lunch_image(
+        self, variant: str = DEFAULT_IMAGE_VARIANT
+    ) -> str | None:
         """Return today's lunch."""
         if self.meal_plan:
             for plan in self.meal_plan:
                 if plan.get("entryType") == "lunch":
                     if plan["recipeId"] and plan["recipe"]["image"]:
-                        url = self.api.async_get_recipe_image_url(plan["recipeId"])
+                        url = self.api.async_get_recipe_image_url(
+                            plan["recipeId"], variant, plan["recipe"].get("image")
+                        )
                         if url != self.last_lunch_image:
                             self.last_lunch_image = url
                             self.last_lunch_image_update = dt_util.now()
@@ -125,13 +290,17 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
             self.last_lunch_image_update = None
         return None
 
-    def todays_dinner_image(self) -> str | None:
+    def todays_dinner_image(
+        self, variant: str = DEFAULT_IMAGE_VARIANT
+    ) -> str | None:
         """Return today's dinner image."""
         if self.meal_plan:
             for plan in self.meal_plan:
                 if plan.get("entryType") == "dinner":
                     if plan["recipeId"] and plan["recipe"]["image"]:
-                        url = self.api.async_get_recipe_image_url(plan["recipeId"])
+                        url = self.api.async_get_recipe_image_url(
+                            plan["recipeId"], variant, plan["recipe"].get("image")
+                        )
                         if url != self.last_dinner_image:
                             self.last_dinner_image = url
                             self.last_dinner_image_update = dt_util.now()
@@ -141,13 +310,17 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
             self.last_dinner_image_update = None
         return None
 
-    def todays_side_image(self) -> str | None:
+    def todays_side_image(
+        self, variant: str = DEFAULT_IMAGE_VARIANT
+    ) -> str | None:
         """Return today's side image."""
         if self.meal_plan:
             for plan in self.meal_plan:
                 if plan.get("entryType") == "side":
                     if plan["recipeId"]:
-                        url = self.api.async_get_recipe_image_url(plan["recipeId"])
+                        url = self.api.async_get_recipe_image_url(
+                            plan["recipeId"], variant, plan["recipe"].get("image")
+                        )
                         if url != self.last_side_image:
                             self.last_side_image = url
                             self.last_side_image_update = dt_util.now()
@@ -197,13 +370,254 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
                         return url
         return None
 
+    def todays_recipe_details(self, entry_type: str) -> dict:
+        """Return details of today's recipe for a meal."""
+        if self.meal_plan:
+            for plan in self.meal_plan:
+                if plan.get("entryType") == entry_type:
+                    if plan["recipeId"] and (
+                        recipe := self._recipes.get(plan["recipe"]["slug"])
+                    ):
+                        return {
+                            ATTR_DESCRIPTION: recipe.get("description"),
+                            ATTR_INGREDIENTS: [
+                                ingredient.get("display") or ingredient.get("note")
+                                for ingredient in recipe.get("recipeIngredient") or []
+                            ],
+                            ATTR_PREP_TIME: recipe.get("prepTime"),
+                            ATTR_COOK_TIME: recipe.get("performTime")
+                            or recipe.get("cookTime"),
+                            ATTR_TOTAL_TIME: recipe.get("totalTime"),
+                            ATTR_SERVINGS: recipe.get("recipeServings")
+                            or recipe.get("recipeYield"),
+                        }
+        return {}
+
+    def _meal_plan(self, entry_type: str, day_offset: int) -> dict | None:
+        """Return the first meal plan of a type on a later day."""
+        day = dt_util.now().date() + timedelta(days=day_offset)
+        for entry in self.meal_plan_index.day(day):
+            if entry.plan["entryType"] == entry_type:
+                return entry.plan
+        return None
+
+    def meal(self, entry_type: str, day_offset: int) -> str | None:
+        """Return the meal of a type on a later day."""
+        if (plan := self._meal_plan(entry_type, day_offset)) is None:
+            return None
+        if plan["recipeId"]:
+            return plan["recipe"]["name"]
+        return plan["title"]
+
+    def meal_recipe_url(self, entry_type: str, day_offset: int) -> str | None:
+        """Return the recipe url of the meal of a type on a later day."""
+        plan = self._meal_plan(entry_type, day_offset)
+        if plan and plan["recipeId"]:
+            return self.api.async_get_recipe_url(plan["recipe"]["slug"])
+        return None
+
+    def meal_image(
+        self, entry_type: str, day_offset: int, variant: str = DEFAULT_IMAGE_VARIANT
+    ) -> tuple[str | None, datetime | None]:
+        """Return the image url of the meal of a type on a later day and when it changed."""
+        url = None
+        plan = self._meal_plan(entry_type, day_offset)
+        if plan and plan["recipeId"] and plan["recipe"].get("image"):
+            url = self.api.async_get_recipe_image_url(
+                plan["recipeId"], variant, plan["recipe"]["image"]
+            )
+
+        key = (entry_type, day_offset, variant)
+        previous_url, updated = self._meal_images.get(key, (None, None))
+        if url != previous_url:
+            updated = dt_util.now() if url else None
+            self._meal_images[key] = (url, updated)
+        return url, updated
+
+    async def async_get_recipe(self, recipe_slug: str) -> dict | None:
+        """Return a recipe, from the cache when it holds it."""
+        if recipe := self._recipes.get(recipe_slug):
+            return recipe
+        return await self.api.async_get_recipe(recipe_slug)
+
+    async def async_get_meal_plan_recipe_slug(self, meal_plan_id: str) -> str | None:
+        """Return the slug of the recipe planned by a meal plan entry."""
+        plan = next(
+            (plan for plan in self.meal_plan or [] if plan["id"] == meal_plan_id),
+            None,
+        )
+        if plan is None:
+            plan = await self.api.async_get_meal_plan(meal_plan_id)
+
+        if plan and plan.get("recipeId"):
+            return plan["recipe"]["slug"]
+        return None
+
+    async def _async_update_recipes(self) -> None:
+        """Fetch today's recipes that are not cached or have changed."""
+        date_updated = {}
+        for plan in self.meal_plan or []:
+            if plan["recipeId"]:
+                recipe = plan["recipe"]
+                date_updated[recipe["slug"]] = recipe.get("dateUpdated") or recipe.get(
+                    "updatedAt"
+                )
+
+        self._recipes.prune(set(date_updated))
+
+        slugs = [
+            slug
+            for slug, updated in date_updated.items()
+            if self._recipes.needs_fetch(slug, updated)
+        ]
+        if not slugs:
+            return
+
+        results = await asyncio.gather(
+            *(self.api.async_get_recipe(slug) for slug in slugs)
+        )
+        for slug, result in zip(slugs, results):
+            if result is not None:
+                self._recipes.set(slug, date_updated[slug], result)
+
+    async def _async_update_meal_plan_index(self) -> None:
+        """Keep the meal plan index covering the rolling window.
+
+        The whole window is fetched now and then to pick up changes, when the
+        day changes only the new days are fetched, and today is replaced from
+        today's meal plan on every refresh.
+        """
+        now = dt_util.now()
+        today = now.date()
+        start = today - timedelta(days=self._meal_plan_days_before)
+        end = today + timedelta(days=self._meal_plan_days_after)
+
+        if (
+            self.meal_plan_window is None
+            or now - self._last_meal_plan_index_refresh >= MEAL_PLAN_INDEX_INTERVAL
+        ):
+            result = await self.api.async_get_meal_plans(
+                f"{start:%Y-%m-%d}", f"{end:%Y-%m-%d}"
+            )
+            if result is not None:
+                self.meal_plan_index.remove_before(start)
+                self.meal_plan_index.replace(start, end, result.get("items"))
+                self.meal_plan_window = (start, end)
+                self._last_meal_plan_index_refresh = now
+
+        elif self.meal_plan_window != (start, end):
+            _, previous_end = self.meal_plan_window
+            self.meal_plan_index.remove_before(start)
+
+            if end > previous_end:
+                fetch_start = max(start, previous_end + timedelta(days=1))
+                result = await self.api.async_get_meal_plans(
+                    f"{fetch_start:%Y-%m-%d}", f"{end:%Y-%m-%d}"
+                )
+                if result is not None:
+                    self.meal_plan_index.replace(fetch_start, end, result.get("items"))
+                    self.meal_plan_window = (start, end)
+            else:
+                self.meal_plan_window = (start, end)
+
+        if self.meal_plan_window is not None:
+            self.meal_plan_index.replace(today, today, self.meal_plan or [])
+
+    @callback
+    def _async_schedule_image_prefetch(self) -> None:
+        """Prefetch upcoming meal images in the background now and then."""
+        now = dt_util.now()
+
+        if self._image_prefetch_task and not self._image_prefetch_task.done():
+            return
+        if (
+            self._last_image_prefetch
+            and self._last_image_prefetch.date() == now.date()
+            and now - self._last_image_prefetch < IMAGE_PREFETCH_INTERVAL
+        ):
+            return
+
+        self._last_image_prefetch = now
+        self._image_prefetch_task = self.config_entry.async_create_background_task(
+            self.hass, self._async_prefetch_images(), f"{DOMAIN} image prefetch"
+        )
+
+    async def _async_prefetch_images(self) -> None:
+        """Fetch the images of today's and tomorrow's meals not yet cached.
+
+        The meals are read from the meal plan index, so no request is made
+        for them.
+        """
+        today = dt_util.now().date()
+        tomorrow = today + timedelta(days=1)
+        plans = [
+            entry.plan
+            for day in (today, tomorrow)
+            for entry in self.meal_plan_index.day(day)
+        ]
+
+        domain_config = self.hass.data[DOMAIN][DOMAIN_CONFIG]
+        variants = {
+            domain_config[CONF_IMAGE_VARIANT],
+            *domain_config[CONF_IMAGE_VARIANTS].values(),
+        }
+        max_width = domain_config.get(CONF_IMAGE_MAX_WIDTH)
+
+        urls = {
+            self.api.async_get_recipe_image_url(
+                plan["recipeId"], variant, plan["recipe"].get("image")
+            )
+            for plan in plans
+            if plan["recipeId"]
+            for variant in variants
+        }
+
+        semaphore = asyncio.Semaphore(IMAGE_PREFETCH_CONCURRENCY)
+        budget = IMAGE_PREFETCH_MAX_BYTES
+
+        async def _async_prefetch(url: str) -> None:
+            nonlocal budget
+            reserved = 0
+
+            def _reserve(size: int) -> bool:
+                """Take the image's size from the budget before reading it."""
+                nonlocal budget, reserved
+                if budget <= 0 or size > budget:
+                    return False
+                budget -= size
+                reserved = size
+                return True
+
+            async with semaphore:
+                if budget <= 0:
+                    return
+                if (content := await self.api.async_get_image(url, _reserve)) is None:
+                    return
+
+                # Images whose size was not reported are taken once read
+                budget -= len(content) - reserved
+                if max_width:
+                    content = await self.hass.async_add_executor_job(
+                        downscale_image, content, max_width
+                    )
+                self.images.set(url, max_width, content)
+
+        await asyncio.gather(
+            *(
+                _async_prefetch(url)
+                for url in urls
+                if not self.images.has(url, max_width)
+            )
+        )
+
     async def async_get_shopping_lists(self) -> dict:
-        """Return shopping lists  fetched at most once."""
+        """Return shopping lists, normally already fetched by the first refresh."""
         if self._shopping_lists is None:
 
             result = await self.api.async_get_shopping_lists()
 
             self._shopping_lists = result.get("items")
+            self._shopping_lists_fetched = True
         return self._shopping_lists
 
     async def async_get_shopping_lists_items(self, shopping_list_id) -> dict:
@@ -213,41 +627,435 @@ class MealieDataUpdateCoordinator(DataUpdateCoordinator):
         items = result.get("items")
         return items
 
-    async def _async_update_data(self):
-        """Update data."""
+    async def async_get_unit_ids(self) -> dict[str, str]:
+        """Return unit ids by lower case name, fetched at most once."""
+        if self._unit_ids is None:
+            result = await self.api.async_get_units()
+            if result is None:
+                return {}
+
+            self._unit_ids = {}
+            for unit in result.get("items"):
+                self._unit_ids[unit["name"].casefold()] = unit["id"]
+                if unit.get("abbreviation"):
+                    self._unit_ids[unit["abbreviation"].casefold()] = unit["id"]
+        return self._unit_ids
+
+    async def async_get_labels(self) -> list[dict] | None:
+        """Return the labels of our group, fetched at most once."""
+        if self._labels is None:
+            if (result := await self.api.async_get_labels()) is not None:
+                self._labels = result.get("items")
+        return self._labels
 
-        # Today's meal plan
+    async def async_get_label_ids(self) -> dict[str, str]:
+        """Return label ids by lower case name, fetched at most once."""
+        if self._label_ids is None:
+            if (labels := await self.async_get_labels()) is None:
+                return {}
+
+            self._label_ids = {
+                label["name"].casefold(): label["id"] for label in labels
+            }
+        return self._label_ids
+
+    def unchecked_item_count(
+        self, shopping_list_id: str | None = None, label_id: str | None = None
+    ) -> int:
+        """Return how many items are unchecked, on a list and with a label if given."""
+        counts = (
+            self.shopping_list_counts.values()
+            if shopping_list_id is None
+            else [self.shopping_list_counts.get(shopping_list_id)]
+        )
+        return sum(
+            (count.total if label_id is None else count.by_label[label_id])
+            for count in counts
+            if count is not None
+        )
 
+    def next_shopping_list_position(self, shopping_list_id: str) -> int:
+        """Return the position after the last item of a shopping list."""
+        items = self.shopping_list_items.get(shopping_list_id)
+        if items:
+            return items[-1].get("position") + 1
+        return 0
+
+    def find_shopping_list_item(
+        self, shopping_list_id: str, note: str, food_id: str | None = None
+    ) -> dict | None:
+        """Return an unchecked item of a shopping list matching a note or food.
+
+        Notes match ignoring case and whitespace, and the food id where given.
+        """
+        if (index := self._shopping_list_indexes.get(shopping_list_id)) is None:
+            return None
+
+        for key in item_keys(food_id, note):
+            if (item := index.get(key)) is not None:
+                return item
+        return None
+
+    def meal_data_version(self) -> tuple[int, int, int]:
+        """Return the version of the meal plans and recipes, changed with them."""
+        return (
+            self._meal_plan_version,
+            self.meal_plan_index.version,
+            self._recipes.version,
+        )
+
+    def shopping_list_version(self, shopping_list_id: str) -> int | None:
+        """Return the version of a list's items, changed whenever they are."""
+        return self._shopping_list_versions.get(shopping_list_id)
+
+    def get_write_queue(self, shopping_list_id: str) -> ShoppingListWriteQueue:
+        """Return the write queue of a shopping list."""
+        if shopping_list_id not in self._write_queues:
+            self._write_queues[shopping_list_id] = ShoppingListWriteQueue(
+                self.hass, self, shopping_list_id
+            )
+        return self._write_queues[shopping_list_id]
+
+    def shopping_list_lock(self, shopping_list_id: str) -> asyncio.Lock:
+        """Return the lock held while changing the items of a shopping list."""
+        if shopping_list_id not in self._shopping_list_locks:
+            self._shopping_list_locks[shopping_list_id] = asyncio.Lock()
+        return self._shopping_list_locks[shopping_list_id]
+
+    def _index_shopping_list_items(
+        self,
+        shopping_list_id: str,
+        items: list,
+        removed: list[str] | None = None,
+        full: bool = True,
+    ) -> None:
+        """Count and index the unchecked items of a whole list, or those changed."""
+        if (counts := self.shopping_list_counts.get(shopping_list_id)) is None:
+            counts = self.shopping_list_counts[shopping_list_id] = (
+                UncheckedItemCounts()
+            )
+        if (index := self._shopping_list_indexes.get(shopping_list_id)) is None:
+            index = self._shopping_list_indexes[shopping_list_id] = (
+                UncheckedItemIndex()
+            )
+        if full:
+            counts.replace(items)
+            index.replace(items)
+        else:
+            counts.update(items, removed or [])
+            index.update(items, removed)
+
+    def _set_shopping_list_items(
+        self,
+        shopping_list_id: str,
+        items: list,
+        changed: list | None = None,
+        removed: list[str] | None = None,
+    ) -> None:
+        """Store a new version of a list's items, keeping changes not yet written.
+
+        The stored list is never changed in place, changes replace it. When
+        only some items changed, only those are counted and indexed again.
+        """
+        if (queue := self._write_queues.get(shopping_list_id)) is not None:
+            items = queue.async_overlay(items)
+            if changed is not None:
+                changed = queue.async_overlay(changed)
+        self.shopping_list_items.update({shopping_list_id: items})
+        self._snapshot_changed = True
+        if changed is None:
+            self._index_shopping_list_items(shopping_list_id, items)
+        else:
+            self._index_shopping_list_items(
+                shopping_list_id, changed, removed, full=False
+            )
+        self._shopping_list_versions[shopping_list_id] = (
+            self._shopping_list_versions.get(shopping_list_id, 0) + 1
+        )
+
+    def _set_shopping_list_watermark(
+        self, shopping_list_id: str, items: list
+    ) -> None:
+        """Remember the newest change seen, to fetch only later changes."""
+        for field in ("updatedAt", "updateAt"):
+            if stamps := [item[field] for item in items if item.get(field)]:
+                newest = max(stamps)
+                if (current := self._shopping_list_watermarks.get(shopping_list_id)):
+                    newest = max(newest, current[1])
+                self._shopping_list_watermarks[shopping_list_id] = (field, newest)
+                return
+
+    def _merge_shopping_list_items(
+        self, shopping_list_id: str, items: list, removed: list[str] | None = None
+    ) -> None:
+        """Merge changed items into those already stored.
+
+        Items equal to those stored, and removals of items not stored, are
+        dropped, leaving the list and its version alone if nothing changed.
+        """
+        merged = {
+            item["id"]: item
+            for item in self.shopping_list_items.get(shopping_list_id, [])
+        }
+        items = [item for item in items if merged.get(item["id"]) != item]
+        removed = [item_id for item_id in removed or [] if item_id in merged]
+        if not items and not removed:
+            return
+
+        for item_id in removed:
+            merged.pop(item_id, None)
+        merged.update((item["id"], item) for item in items)
+        self._set_shopping_list_items(
+            shopping_list_id,
+            sorted(merged.values(), key=lambda item: item.get("position") or 0),
+            items,
+            removed,
+        )
+
+    @callback
+    def async_apply_shopping_list_changes(
+        self,
+        shopping_list_id: str,
+        items: list[dict] | None = None,
+        removed: list[str] | None = None,
+    ) -> None:
+        """Apply items changed or removed from Home Assistant to a list."""
+        self._merge_shopping_list_items(shopping_list_id, items or [], removed)
+        self.async_update_listeners()
+        self._async_schedule_snapshot_save()
+
+    async def async_write_shopping_list(
+        self, shopping_list_id: str, write: Awaitable[dict | None], message: str
+    ) -> dict | None:
+        """Make a write to a shopping list, raising for Home Assistant if it fails.
+
+        The write must be made with raise_errors, so it is told apart from
+        other requests failing meanwhile, and only Mealie refusing the token
+        asks to log in again. Servers without bulk writes may have written
+        some of the items before failing, so the list is fetched again.
+        """
         try:
-            result = await self.api.async_get_meal_plans_today()
+            return await write
+        except MealieAuthError as error:
+            raise ConfigEntryAuthFailed("Unable to login, please re-login.") from error
+        except MealieApiError as error:
+            await self.async_refresh_shopping_list(shopping_list_id)
+            raise HomeAssistantError(f"{message} ({error})") from error
 
-            if self.api.error:
-                raise ConfigEntryAuthFailed(
-                    "Unable to login, please re-login."
-                ) from None
+    async def async_apply_shopping_list_result(
+        self, shopping_list_id: str, result: dict | None
+    ) -> None:
+        """Apply the items a write returned, refreshing the list if it had none.
 
-            self.meal_plan = result
+        Created, updated and deleted items are all applied, as the server can
+        merge created items into those already on the list.
+        """
+        if (changes := returned_changes(result)) is not None:
+            self.async_apply_shopping_list_changes(shopping_list_id, *changes)
+        else:
+            await self.async_refresh_shopping_list(shopping_list_id)
 
-        except Exception as exception:
-            raise UpdateFailed(exception) from exception
+    async def _async_fetch_shopping_list(
+        self, shopping_list_id: str, full: bool, poll: bool = False
+    ) -> None:
+        """Fetch a shopping list's items, in full or only those changed.
 
-        # Shopping lists
+        When polling, items that changed here while the fetch was in flight,
+        or that are being changed, win and the fetch is left for next time.
+        Raise MealieApiError if the fetch failed.
+        """
+        watermark = self._shopping_list_watermarks.get(shopping_list_id)
+        version = self._shopping_list_versions.get(shopping_list_id)
+        if full or watermark is None or not self.api.capabilities.query_filter:
+            watermark = None
+            result = await self.api.async_get_shopping_list_items(
+                shopping_list_id, raise_errors=True
+            )
+        else:
+            result = await self.api.async_get_shopping_list_items(
+                shopping_list_id, watermark[1], watermark[0], raise_errors=True
+            )
 
-        if not self._shopping_lists:
+        if poll and (
+            self.shopping_list_lock(shopping_list_id).locked()
+            or version != self._shopping_list_versions.get(shopping_list_id)
+        ):
             return
+
+        if watermark is None:
+            self._shopping_list_watermarks.pop(shopping_list_id, None)
+            self._shopping_list_reconciled[shopping_list_id] = dt_util.utcnow()
+            if result.get("items") != self.shopping_list_items.get(shopping_list_id):
+                self._set_shopping_list_items(shopping_list_id, result.get("items"))
+        else:
+            self._merge_shopping_list_items(shopping_list_id, result.get("items"))
+
+        self._set_shopping_list_watermark(shopping_list_id, result.get("items"))
+
+    async def async_refresh_shopping_list(self, shopping_list_id: str) -> None:
+        """Refresh all the items of a single shopping list."""
         try:
+            await self._async_fetch_shopping_list(shopping_list_id, True)
+        except MealieApiError:
+            return
+
+        self.async_update_listeners()
+        self._async_schedule_snapshot_save()
+
+    async def _async_update_shopping_lists(self, timeout: float) -> None:
+        """Refresh the items of every shopping list within the timeout.
+
+        Only items changed since the last refresh are fetched, with all the
+        items fetched now and then to drop those deleted.
+        """
+        now = dt_util.utcnow()
+        shopping_list_ids = [value.get("id") for value in self._shopping_lists]
+        tasks = {
+            self.hass.async_create_task(
+                self._async_fetch_shopping_list(
+                    shopping_list_id,
+                    now - self._shopping_list_reconciled.get(shopping_list_id, now)
+                    >= SHOPPING_LIST_RECONCILE_INTERVAL,
+                    poll=True,
+                )
+            ): shopping_list_id
+            for shopping_list_id in shopping_list_ids
+        }
+
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+        # Lists that failed keep their items like those not in by the timeout,
+        # only Mealie refusing the token fails the refresh
+        failed = {tasks[task]: task.exception() for task in done if task.exception()}
+        for error in failed.values():
+            if isinstance(error, MealieAuthError):
+                raise error
+
+        self.stale_shopping_lists = {tasks[task] for task in pending} | set(failed)
+        for shopping_list_id, error in failed.items():
+            LOGGER.warning(
+                "Shopping list %s did not refresh, will retry (%s)",
+                shopping_list_id,
+                error,
+            )
+        if pending:
+            LOGGER.warning(
+                "Shopping lists %s did not refresh in time, will retry",
+                ", ".join(sorted(tasks[task] for task in pending)),
+            )
+
+    @callback
+    def _async_set_shopping_lists(self, shopping_lists: list[dict]) -> None:
+        """Store the fetched catalog, reloading if it differs from the snapshot.
+
+        Entities are made for the lists known at setup, so lists created or
+        deleted while Home Assistant was not running need a reload.
+        """
+        seeded = self._shopping_lists
+        self._shopping_lists = shopping_lists
+        self._shopping_lists_fetched = True
+        if seeded == shopping_lists:
+            return
+
+        self._snapshot_changed = True
+        if seeded is not None and {value.get("id") for value in seeded} != {
+            value.get("id") for value in shopping_lists
+        }:
+            LOGGER.info("Mealie shopping lists changed, reloading")
+            self.hass.config_entries.async_schedule_reload(
+                self.config_entry.entry_id
+            )
 
-            for value in self._shopping_lists:
-                shopping_list_id = value.get("id")
-                result = await self.api.async_get_shopping_list_items(shopping_list_id)
+    async def _async_update_data(self):
+        """Update data, backing off and keeping the last data while failing.
+
+        Only Mealie refusing the token asks to log in again, other failures
+        such as Mealie restarting leave entities showing the data they had,
+        marked stale, and refresh less often until Mealie is back.
+        """
+        try:
+            await self._async_refresh_data()
+        except UpdateFailed:
+            self.consecutive_failures += 1
+            self.update_interval = min(
+                UPDATE_INTERVAL * 2**self.consecutive_failures, BACKOFF_MAX_INTERVAL
+            )
+            if self.meal_plan or self.shopping_list_items:
+                self.stale = True
+            raise
 
-                if self.api.error:
-                    raise ConfigEntryAuthFailed(
-                        "Unable to login, please re-login."
-                    ) from None
+        self.consecutive_failures = 0
+        self.update_interval = UPDATE_INTERVAL
 
-                items = result.get("items")
-                self.shopping_list_items.update({shopping_list_id: items})
+    async def _async_refresh_data(self) -> None:
+        """Refresh the meal plan and shopping lists.
 
+        Failed requests raise the error telling why, so only Mealie refusing
+        the token asks to log in again.
+        """
+        try:
+            await self._async_refresh_all()
+        except TimeoutError as error:
+            raise UpdateFailed("Timed out refreshing from Mealie") from error
+        except MealieAuthError as error:
+            raise ConfigEntryAuthFailed("Unable to login, please re-login.") from error
+        except MealieApiError as error:
+            raise UpdateFailed(f"Unable to refresh from Mealie ({error})") from error
+        except (ConfigEntryAuthFailed, UpdateFailed):
+            raise
         except Exception as exception:
             raise UpdateFailed(exception) from exception
+
+        self.stale = False
+        self._async_schedule_snapshot_save()
+        self._async_schedule_image_prefetch()
+
+    async def _async_refresh_all(self) -> None:
+        """Fetch the meal plan and shopping lists, raising if a request failed.
+
+        The meal plan, recipes and index must be in by the deadline, and the
+        shopping lists are given what time is left of it, a second at least.
+        """
+        deadline = self.hass.loop.time() + REFRESH_DEADLINE
+
+        # Today's meal plan, along with the shopping list catalog on first load
+
+        async with asyncio.timeout_at(deadline):
+            if not self._shopping_lists_fetched:
+                result, shopping_lists = await asyncio.gather(
+                    self.api.async_get_meal_plans_today(raise_errors=True),
+                    self.api.async_get_shopping_lists(raise_errors=True),
+                )
+            else:
+                result = await self.api.async_get_meal_plans_today(raise_errors=True)
+                shopping_lists = None
+
+            if result != self.meal_plan:
+                self.meal_plan = result
+                self._meal_plan_version += 1
+                self._snapshot_changed = True
+
+            if shopping_lists is not None:
+                self._async_set_shopping_lists(shopping_lists.get("items"))
+
+            await asyncio.gather(
+                self._async_update_recipes(), self._async_update_meal_plan_index()
+            )
+
+        # Shopping lists, those not in by the deadline keep their items and
+        # are retried on the next refresh
+
+        if self._shopping_lists:
+            await self._async_update_shopping_lists(
+                max(deadline - self.hass.loop.time(), 1)
+            )
+
+    async def async_shutdown(self) -> None:
+        """Write queued changes and stop refreshing."""
+        await asyncio.gather(
+            *(queue.async_shutdown() for queue in self._write_queues.values())
+        )
+        await self._async_save_snapshot()
+        await super().async_shutdown()
@@ -0,0 +1,42 @@
+"""Diagnostics support for Mealie."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_TOKEN
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, COORDINATOR
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
+
+TO_REDACT = {CONF_HOST, CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: MealieDataUpdateCoordinator = hass.data[DOMAIN][COORDINATOR]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "version": coordinator.version,
+        "startup": coordinator.startup_timings,
+        "capabilities": coordinator.api.capabilities.as_dict(),
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "consecutive_failures": coordinator.consecutive_failures,
+        "last_error": repr(coordinator.last_exception),
+        "shopping_lists": {
+            shopping_list_id: len(items)
+            for shopping_list_id, items in coordinator.shopping_list_items.items()
+        },
+        "stale_shopping_lists": sorted(coordinator.stale_shopping_lists),
+        "meal_plans_indexed": len(coordinator.meal_plan_index),
+        "api_queue_depth": coordinator.api.rate_limiter.queue_depth,
+    }
@@ -0,0 +1,86 @@
+"""Mealie API endpoints, resolved against the server's base url."""
+
+from __future__ import annotations
+
+from enum import StrEnum
+from urllib.parse import quote
+
+from yarl import URL
+
+URL_CACHE_SIZE = 256
+
+# Mealie 2 moved what a household shares from the group to the household
+GROUP_PREFIX = "api/groups/"
+HOUSEHOLD_PREFIX = "api/households/"
+
+
+class Endpoint(StrEnum):
+    """Paths of the Mealie endpoints, relative to the base url."""
+
+    APP_ABOUT = "api/app/about"
+    GROUPS_SELF = "api/groups/self"
+    SHOPPING_LISTS = "api/groups/shopping/lists"
+    SHOPPING_ITEMS = "api/groups/shopping/items"
+    SHOPPING_ITEMS_CREATE_BULK = "api/groups/shopping/items/create-bulk"
+    SHOPPING_ITEM = "api/groups/shopping/items/{item_id}"
+    UNITS = "api/units"
+    LABELS = "api/groups/labels"
+    MEAL_PLANS = "api/groups/mealplans"
+    MEAL_PLANS_TODAY = "api/groups/mealplans/today"
+    MEAL_PLAN = "api/groups/mealplans/{meal_plan_id}"
+    RECIPE = "api/recipes/{recipe_slug}"
+    RECIPE_IMAGE = "api/media/recipes/{recipe_id}/images/{variant}.webp"
+    RECIPE_PAGE = "g/home/r/{recipe_slug}"
+
+
+HOUSEHOLD_ENDPOINTS = frozenset(
+    {
+        Endpoint.SHOPPING_LISTS,
+        Endpoint.SHOPPING_ITEMS,
+        Endpoint.SHOPPING_ITEMS_CREATE_BULK,
+        Endpoint.SHOPPING_ITEM,
+        Endpoint.MEAL_PLANS,
+        Endpoint.MEAL_PLANS_TODAY,
+        Endpoint.MEAL_PLAN,
+    }
+)
+
+
+def base_url(host: str) -> URL:
+    """Parse the configured host into the base url of the Mealie server.
+
+    The scheme defaults to http, and any sub-path Mealie is served under is
+    kept with a trailing slash so endpoints resolve below it.
+    """
+    url = URL(host.strip() if "://" in host else f"http://{host.strip()}")
+    if url.scheme not in ("http", "https") or not url.host:
+        raise ValueError(f"Invalid Mealie address {host}")
+
+    path = "/".join(segment for segment in url.path.split("/") if segment)
+    return url.with_path(f"/{path}/" if path else "/").with_fragment(None)
+
+
+class EndpointRegistry:
+    """Build the urls of endpoints once and hand out the same URL objects."""
+
+    def __init__(self, base: URL, households: bool = False) -> None:
+        """Initialize, resolving household endpoints for Mealie 2 if asked."""
+        self.base = base
+        self.households = households
+        self._urls: dict[tuple[Endpoint, tuple[str, ...]], URL] = {}
+
+    def url(self, endpoint: Endpoint, **params: str) -> URL:
+        """Return the url of an endpoint, with its path parameters filled in."""
+        key = (endpoint, tuple(params.values()))
+        if (url := self._urls.get(key)) is None:
+            if len(self._urls) >= URL_CACHE_SIZE:
+                self._urls.clear()
+            path = endpoint.value
+            if self.households and endpoint in HOUSEHOLD_ENDPOINTS:
+                path = HOUSEHOLD_PREFIX + path.removeprefix(GROUP_PREFIX)
+            if params:
+                path = path.format(
+                    **{name: quote(value, safe="") for name, value in params.items()}
+                )
+            url = self._urls[key] = self.base.join(URL(path))
+        return url
@@ -2,17 +2,24 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, NAME, MANUFACTURER, ATTR_STALE
 
-from .const import DOMAIN, NAME, VERSION, MANUFACTURER
-from .coordinator import MealieDataUpdateCoordinator
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
 
 
 class MealieEntity(CoordinatorEntity):
     """MealieEntity class."""
 
     _attr_has_entity_name = True
+    _last_written_state: tuple | None = None
 
     def __init__(
         self,
@@ -25,9 +32,47 @@ class MealieEntity(CoordinatorEntity):
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, self.unique_id)},
             name=NAME,
-            model=VERSION,
+            model=coordinator.version,
             manufacturer=MANUFACTURER,
         )
 
         if entity_description:
             self.entity_description = entity_description
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available, persisted data counts until refreshed."""
+        return super().available or self.coordinator.stale
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str] | None:
+        """Return the state attributes."""
+        if self.coordinator.stale:
+            return {ATTR_STALE: True}
+        return None
+
+    def _state_signature(self) -> tuple[Any, ...]:
+        """Return what the state is worked out from, to tell whether it changed.
+
+        Only the data the coordinator changes is compared, not the state and
+        attributes worked out from it, so checking costs little. Meals are
+        read for a day, so the date is compared too.
+        """
+        return (
+            self.available,
+            self.coordinator.stale,
+            dt_util.now().date(),
+            self.coordinator.meal_data_version(),
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine, remembering what was written."""
+        self._last_written_state = self._state_signature()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator, writing only changes."""
+        if self._state_signature() != self._last_written_state:
+            self.async_write_ha_state()
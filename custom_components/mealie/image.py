@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from pathlib import Path
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.image import (
@@ -13,9 +15,23 @@ from homeassistant.components.image import (
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import UNDEFINED
 
-from .const import DOMAIN, COORDINATOR, MEALIE_LOGO, ATTR_RECIPE_URL
+from .const import (
+    DOMAIN,
+    DOMAIN_CONFIG,
+    COORDINATOR,
+    MEAL_TYPES,
+    MEALIE_LOGO,
+    ATTR_RECIPE_URL,
+    CONF_IMAGE_VARIANT,
+    CONF_IMAGE_VARIANTS,
+    CONF_IMAGE_MAX_WIDTH,
+    CONF_MEAL_DAY_OFFSETS,
+)
+from .cache import downscale_image
 from .entity import MealieEntity
-from .coordinator import MealieDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
 
 
 ENTITY_DESCRIPTIONS = (
@@ -38,6 +54,39 @@ ENTITY_DESCRIPTIONS = (
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class MealieMealImageEntityDescription(ImageEntityDescription):
+    """Describes a Mealie image for a meal on a later day."""
+
+    entry_type: str
+    day_offset: int
+
+
+def _meal_entity_descriptions(
+    day_offsets: list[int],
+) -> list[MealieMealImageEntityDescription]:
+    """Return the descriptions of the images for meals on later days."""
+    descriptions = []
+    for day_offset in day_offsets:
+        for entry_type in MEAL_TYPES:
+            if day_offset == 1:
+                key = f"tomorrows_{entry_type}"
+                translation_key = key
+            else:
+                key = f"{entry_type}_in_{day_offset}_days"
+                translation_key = f"{entry_type}_in_days"
+            descriptions.append(
+                MealieMealImageEntityDescription(
+                    key=key,
+                    translation_key=translation_key,
+                    translation_placeholders={"days": str(day_offset)},
+                    entry_type=entry_type,
+                    day_offset=day_offset,
+                )
+            )
+    return descriptions
+
+
 @dataclass
 class Image:
     """Represent an image."""
@@ -58,10 +107,22 @@ async def async_setup_entry(
         MealieImage(
             entity_description=entity_description,
             coordinator=coordinator,
+            domain_config=hass.data[DOMAIN][DOMAIN_CONFIG],
         )
         for entity_description in ENTITY_DESCRIPTIONS
     )
 
+    async_add_entities(
+        MealieMealImage(
+            entity_description=entity_description,
+            coordinator=coordinator,
+            domain_config=hass.data[DOMAIN][DOMAIN_CONFIG],
+        )
+        for entity_description in _meal_entity_descriptions(
+            hass.data[DOMAIN][DOMAIN_CONFIG][CONF_MEAL_DAY_OFFSETS]
+        )
+    )
+
 
 class MealieImage(MealieEntity, ImageEntity):
     """Mealie Image class."""
@@ -73,6 +134,7 @@ class MealieImage(MealieEntity, ImageEntity):
         self,
         entity_description: ImageEntityDescription,
         coordinator: MealieDataUpdateCoordinator,
+        domain_config: dict,
     ) -> None:
         """Initialize the sensor class."""
         super().__init__(entity_description, coordinator)
@@ -85,32 +147,50 @@ class MealieImage(MealieEntity, ImageEntity):
         self.coordinator = coordinator
         self._attr_has_entity_name = True
         self.current_image = None
+        self._image_variant = domain_config[CONF_IMAGE_VARIANTS].get(
+            entity_description.key, domain_config[CONF_IMAGE_VARIANT]
+        )
+        self._image_max_width = domain_config.get(CONF_IMAGE_MAX_WIDTH)
 
     async def async_added_to_hass(self) -> None:
-        """Handle added to Hass."""
+        """Handle added to Hass, showing the data the coordinator already has."""
         await super().async_added_to_hass()
+        self._update_image_url()
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
 
-        self._cached_image = None
+        image_url = self.image_url
+        self._update_image_url()
+        if self.image_url != image_url:
+            self._cached_image = None
 
+        super()._handle_coordinator_update()
+
+    def _update_image_url(self) -> None:
+        """Update the image url and when it last changed."""
         if self.entity_description.key == "todays_breakfast":
-            self._attr_image_url = self.coordinator.todays_breakfast_image()
+            self._attr_image_url = self.coordinator.todays_breakfast_image(
+                self._image_variant
+            )
             self._attr_image_last_updated = self.coordinator.last_breakfast_image_update
         if self.entity_description.key == "todays_lunch":
-            self._attr_image_url = self.coordinator.todays_lunch_image()
+            self._attr_image_url = self.coordinator.todays_lunch_image(
+                self._image_variant
+            )
             self._attr_image_last_updated = self.coordinator.last_lunch_image_update
         if self.entity_description.key == "todays_dinner":
-            self._attr_image_url = self.coordinator.todays_dinner_image()
+            self._attr_image_url = self.coordinator.todays_dinner_image(
+                self._image_variant
+            )
             self._attr_image_last_updated = self.coordinator.last_dinner_image_update
         if self.entity_description.key == "todays_side":
-            self._attr_image_url = self.coordinator.todays_side_image()
+            self._attr_image_url = self.coordinator.todays_side_image(
+                self._image_variant
+            )
             self._attr_image_last_updated = self.coordinator.last_side_image_update
 
-        super()._handle_coordinator_update()
-
     async def _async_load_image_from_url(self, url: str) -> Image | None:
         """Load an image by url."""
         if response := await self._fetch_url(url):
@@ -125,6 +205,24 @@ class MealieImage(MealieEntity, ImageEntity):
 
         return self.current_image
 
+    async def _async_load_image(self, url: str) -> bytes | None:
+        """Load image bytes by url, cached per variant and width."""
+        max_width = self._image_max_width
+
+        if (content := self.coordinator.images.get(url, max_width)) is not None:
+            return content
+
+        if (image := await self._async_load_image_from_url(url)) is None:
+            return None
+
+        content = image.content
+        if max_width:
+            content = await self.hass.async_add_executor_job(
+                downscale_image, content, max_width
+            )
+        self.coordinator.images.set(url, max_width, content)
+        return content
+
     async def async_image(self) -> bytes | None:
         """Return bytes of image."""
 
@@ -133,41 +231,62 @@ class MealieImage(MealieEntity, ImageEntity):
         if self._cached_image:
             return self._cached_image.content
 
-        if (url := self.image_url) is not UNDEFINED:
-            if not url or (image := await self._async_load_image_from_url(url)) is None:
-                self.current_image = await self.hass.async_add_executor_job(
-                    mealie_logo_path.read_bytes
-                )
-                self._attr_content_type = "image/png"
-                return self.current_image
-            self._cached_image = image
-            self.current_image = image
-            self._attr_content_type = "image/webp"
-            return image.content
+        if (url := self.image_url) is not UNDEFINED and url:
+            if (content := await self._async_load_image(url)) is not None:
+                self._cached_image = Image(content_type="image/webp", content=content)
+                self.current_image = content
+                self._attr_content_type = "image/webp"
+                return content
+
         self.current_image = await self.hass.async_add_executor_job(
             mealie_logo_path.read_bytes
         )
         self._attr_content_type = "image/png"
         return self.current_image
 
-    @property
-    def extra_state_attributes(self) -> dict[str, str] | None:
-        """Return the state attributes."""
-
+    def _recipe_url(self) -> str | None:
+        """Return the url of the meal's recipe."""
         if self.entity_description.key == "todays_breakfast":
-            url = self.coordinator.todays_breakfast_recipe_url()
+            return self.coordinator.todays_breakfast_recipe_url()
         if self.entity_description.key == "todays_lunch":
-            url = self.coordinator.todays_lunch_recipe_url()
+            return self.coordinator.todays_lunch_recipe_url()
         if self.entity_description.key == "todays_dinner":
-            url = self.coordinator.todays_dinner_recipe_url()
+            return self.coordinator.todays_dinner_recipe_url()
         if self.entity_description.key == "todays_side":
-            url = self.coordinator.todays_side_recipe_url()
+            return self.coordinator.todays_side_recipe_url()
+        return None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, str] | None:
+        """Return the state attributes."""
 
         attrs = {
-            ATTR_RECIPE_URL: url,
+            ATTR_RECIPE_URL: self._recipe_url(),
         }
 
         super_attrs = super().extra_state_attributes
         if super_attrs:
             attrs.update(super_attrs)
         return attrs
+
+
+class MealieMealImage(MealieImage):
+    """Mealie Image class for a meal on a later day."""
+
+    entity_description: MealieMealImageEntityDescription
+
+    def _update_image_url(self) -> None:
+        """Update the image url and when it last changed."""
+        self._attr_image_url, self._attr_image_last_updated = (
+            self.coordinator.meal_image(
+                self.entity_description.entry_type,
+                self.entity_description.day_offset,
+                self._image_variant,
+            )
+        )
+
+    def _recipe_url(self) -> str | None:
+        """Return the url of the meal's recipe."""
+        return self.coordinator.meal_recipe_url(
+            self.entity_description.entry_type, self.entity_description.day_offset
+        )
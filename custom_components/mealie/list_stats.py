@@ -0,0 +1,62 @@
+"""Counts of the unchecked items of Mealie shopping lists."""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+
+_NOT_COUNTED = object()
+
+
+class UncheckedItemCounts:
+    """The unchecked items of a shopping list, in total and per label.
+
+    Counts are kept up to date from the items that change, rather than by
+    counting the whole list again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._label_ids: dict[str, str | None] = {}
+        self.by_label: Counter[str | None] = Counter()
+
+    @property
+    def total(self) -> int:
+        """Return the number of unchecked items."""
+        return len(self._label_ids)
+
+    def _uncount(self, item_id: str) -> bool:
+        """Stop counting an item, return True if it was counted."""
+        if (label_id := self._label_ids.pop(item_id, _NOT_COUNTED)) is _NOT_COUNTED:
+            return False
+        self.by_label[label_id] -= 1
+        if not self.by_label[label_id]:
+            del self.by_label[label_id]
+        return True
+
+    def update(self, items: Iterable[dict], removed: Iterable[str] = ()) -> bool:
+        """Count changed and removed items, return True if a count changed."""
+        changed = False
+        for item_id in removed:
+            changed |= self._uncount(item_id)
+
+        for item in items:
+            if item.get("checked"):
+                changed |= self._uncount(item["id"])
+                continue
+
+            label_id = item.get("labelId")
+            if self._label_ids.get(item["id"], _NOT_COUNTED) != label_id:
+                self._uncount(item["id"])
+                self._label_ids[item["id"]] = label_id
+                self.by_label[label_id] += 1
+                changed = True
+
+        return changed
+
+    def replace(self, items: list[dict]) -> bool:
+        """Count a whole list, adjusting only for items that changed."""
+        item_ids = {item["id"] for item in items}
+        return self.update(
+            items, [item_id for item_id in self._label_ids if item_id not in item_ids]
+        )
@@ -0,0 +1,129 @@
+"""Local index of Mealie meal plans."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from homeassistant.util import dt as dt_util
+
+MEAL_ORDER = {"breakfast": 0, "lunch": 1, "dinner": 2, "side": 3}
+
+
+def _parse_time(time_str: str) -> time:
+    """Return the time of an HH:MM string."""
+    hour, minute = time_str.split(":")
+    return time(int(hour), int(minute))
+
+
+@dataclass
+class MealPlanEntry:
+    """A meal plan entry with its start and end."""
+
+    start: datetime
+    end: datetime
+    plan: dict
+
+
+class MealPlanIndex:
+    """Meal plans sorted by start, for range and next/previous lookups.
+
+    Entries are kept in a list sorted by start and meal, with the starts in
+    a parallel list so lookups are a binary search. The version changes
+    whenever the entries do.
+    """
+
+    def __init__(
+        self, meal_times: dict[str, tuple[str, str]], default_meal: str
+    ) -> None:
+        """Initialize with the start and end time of each meal."""
+        self._meal_times = {
+            meal: (_parse_time(start), _parse_time(end))
+            for meal, (start, end) in meal_times.items()
+        }
+        self._default_meal = default_meal
+        self._starts: list[datetime] = []
+        self._entries: list[MealPlanEntry] = []
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def _entry(self, plan: dict) -> MealPlanEntry:
+        """Return the entry for a meal plan."""
+        start_time, end_time = self._meal_times.get(
+            plan["entryType"], self._meal_times[self._default_meal]
+        )
+        day = date.fromisoformat(plan["date"])
+        return MealPlanEntry(
+            start=datetime.combine(day, start_time, dt_util.DEFAULT_TIME_ZONE),
+            end=datetime.combine(day, end_time, dt_util.DEFAULT_TIME_ZONE),
+            plan=plan,
+        )
+
+    def _day_start(self, day: date) -> datetime:
+        """Return the start of a day."""
+        return datetime.combine(day, time.min, dt_util.DEFAULT_TIME_ZONE)
+
+    def replace(self, start: date, end: date, plans: list[dict]) -> None:
+        """Replace the entries from start to end inclusive with plans."""
+        low = bisect_left(self._starts, self._day_start(start))
+        high = bisect_left(self._starts, self._day_start(end + timedelta(days=1)))
+
+        entries = sorted(
+            (self._entry(plan) for plan in plans),
+            key=lambda entry: (
+                entry.start,
+                MEAL_ORDER.get(entry.plan["entryType"], len(MEAL_ORDER)),
+            ),
+        )
+        if self._entries[low:high] != entries:
+            self._entries[low:high] = entries
+            self._starts[low:high] = [entry.start for entry in entries]
+            self.version += 1
+
+    def remove_before(self, day: date) -> None:
+        """Remove the entries before a day."""
+        if high := bisect_left(self._starts, self._day_start(day)):
+            del self._entries[:high]
+            del self._starts[:high]
+            self.version += 1
+
+    def range(self, start: datetime, end: datetime) -> list[MealPlanEntry]:
+        """Return the entries starting from start up to end."""
+        low = bisect_left(self._starts, start)
+        high = bisect_left(self._starts, end)
+        return self._entries[low:high]
+
+    def day(self, day: date) -> list[MealPlanEntry]:
+        """Return the entries of a day."""
+        return self.range(
+            self._day_start(day), self._day_start(day + timedelta(days=1))
+        )
+
+    def current(self, now: datetime) -> MealPlanEntry | None:
+        """Return the first entry of the meal in progress."""
+        index = bisect_right(self._starts, now) - 1
+        if index < 0:
+            return None
+
+        entry = self._entries[bisect_left(self._starts, self._starts[index])]
+        if entry.end > now:
+            return entry
+        return None
+
+    def next(self, now: datetime) -> MealPlanEntry | None:
+        """Return the first entry starting after now."""
+        index = bisect_right(self._starts, now)
+        if index < len(self._entries):
+            return self._entries[index]
+        return None
+
+    def previous(self, now: datetime) -> MealPlanEntry | None:
+        """Return the last entry starting before now."""
+        index = bisect_left(self._starts, now) - 1
+        if index >= 0:
+            return self._entries[index]
+        return None
@@ -0,0 +1,139 @@
+"""Merge recipe ingredients into a Mealie shopping list."""
+
+from __future__ import annotations
+
+
+def normalize_text(text: str | None) -> str:
+    """Return text lower cased with whitespace collapsed."""
+    return " ".join((text or "").casefold().split())
+
+
+def _key(food_id: str | None, unit_id: str | None, note: str | None) -> tuple:
+    """Return the key items are merged on."""
+    if food_id:
+        return ("food", food_id, unit_id)
+    return ("note", normalize_text(note), unit_id)
+
+
+def item_keys(
+    food_id: str | None, note: str | None, food_name: str | None = None
+) -> list[tuple]:
+    """Return the keys an item is found by when adding it if missing."""
+    keys = []
+    if food_id:
+        keys.append(("food", food_id))
+    for text in (note, food_name):
+        if text := normalize_text(text):
+            keys.append(("text", text))
+    return keys
+
+
+def _unchecked_item_keys(item: dict) -> list[tuple]:
+    """Return the keys an item is found by, none if it is checked."""
+    if item.get("checked"):
+        return []
+    food = item.get("food") or {}
+    return list(
+        dict.fromkeys(
+            item_keys(item.get("foodId"), item.get("note"), food.get("name"))
+        )
+    )
+
+
+class UncheckedItemIndex:
+    """The unchecked items of a shopping list by the keys they are found by.
+
+    The index is kept up to date from the items that change, and is only
+    built again when a whole list is replaced.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._keys: dict[str, list[tuple]] = {}
+        self._items: dict[tuple, dict[str, dict]] = {}
+
+    def get(self, key: tuple) -> dict | None:
+        """Return the first unchecked item indexed by a key."""
+        return next(iter(self._items.get(key, {}).values()), None)
+
+    def _remove(self, item_id: str) -> None:
+        """Stop indexing an item."""
+        for key in self._keys.pop(item_id, []):
+            del self._items[key][item_id]
+            if not self._items[key]:
+                del self._items[key]
+
+    def update(self, items: list[dict], removed: list[str] | None = None) -> None:
+        """Index changed items and stop indexing removed ones."""
+        for item_id in removed or []:
+            self._remove(item_id)
+        for item in items:
+            self._remove(item["id"])
+            if keys := _unchecked_item_keys(item):
+                self._keys[item["id"]] = keys
+                for key in keys:
+                    self._items.setdefault(key, {})[item["id"]] = item
+
+    def replace(self, items: list[dict]) -> None:
+        """Index a whole list again."""
+        self._keys.clear()
+        self._items.clear()
+        self.update(items)
+
+
+def merge_ingredients(
+    shopping_list_id: str,
+    ingredients: list[dict],
+    items: list[dict],
+    position: int,
+) -> tuple[list[dict], list[dict]]:
+    """Merge recipe ingredients with the unchecked items of a shopping list.
+
+    Ingredients with the same food and unit as an unchecked item add to its
+    quantity, the rest become new items. Returns the items to create and
+    the items to update.
+    """
+
+    existing: dict[tuple, dict] = {}
+    for item in items:
+        if not item.get("checked"):
+            existing.setdefault(
+                _key(item.get("foodId"), item.get("unitId"), item.get("note")), item
+            )
+
+    to_create: dict[tuple, dict] = {}
+    to_update: dict[tuple, dict] = {}
+
+    for ingredient in ingredients:
+        food = ingredient.get("food") or {}
+        unit = ingredient.get("unit") or {}
+        note = ingredient.get("note") or ""
+        quantity = ingredient.get("quantity") or 0
+
+        if not food and not note:
+            continue
+
+        key = _key(food.get("id"), unit.get("id"), note)
+
+        if key in to_update or key in existing:
+            if not quantity:
+                continue
+            item = to_update.setdefault(key, dict(existing[key]))
+            item["quantity"] = (item.get("quantity") or 0) + quantity
+        elif key in to_create:
+            to_create[key]["quantity"] += quantity
+        else:
+            to_create[key] = {
+                "shoppingListId": shopping_list_id,
+                "isFood": bool(food),
+                "foodId": food.get("id"),
+                "unitId": unit.get("id"),
+                "labelId": food.get("labelId"),
+                "quantity": quantity,
+                "note": note,
+                "checked": False,
+                "position": position,
+            }
+            position += 1
+
+    return list(to_create.values()), list(to_update.values())
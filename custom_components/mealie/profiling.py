@@ -0,0 +1,104 @@
+"""On demand profiling of the Mealie integration."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import pstats
+import tracemalloc
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+
+PACKAGE_PATH = str(Path(__file__).parent)
+REPORT_LIMIT = 50
+# Deep enough to attribute allocations made on the integration's behalf,
+# such as decoding responses, to its code
+TRACEBACK_FRAMES = 25
+
+
+class MealieProfiler:
+    """Profile the integration for a while and write a report.
+
+    Nothing is hooked in while not profiling, cProfile and tracemalloc are
+    only started for the duration of a run.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Return if a profile is being recorded."""
+        return self._lock.locked()
+
+    async def async_profile(self, duration: float) -> str:
+        """Profile for duration seconds, return the path of the report."""
+        if self._lock.locked():
+            raise HomeAssistantError("A Mealie profile is already being recorded")
+
+        async with self._lock:
+            profiler = cProfile.Profile()
+            started_tracing = not tracemalloc.is_tracing()
+
+            try:
+                profiler.enable()
+            except ValueError as exception:
+                raise HomeAssistantError(
+                    f"Unable to start profiling ({exception})"
+                ) from exception
+
+            if started_tracing:
+                tracemalloc.start(TRACEBACK_FRAMES)
+
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                profiler.disable()
+                snapshot = await self._hass.async_add_executor_job(
+                    tracemalloc.take_snapshot
+                )
+                if started_tracing:
+                    tracemalloc.stop()
+
+            path = self._hass.config.path(
+                f"{DOMAIN}.profile.{dt_util.now():%Y%m%d%H%M%S}.txt"
+            )
+            await self._hass.async_add_executor_job(
+                _write_report, path, duration, profiler, snapshot
+            )
+
+        LOGGER.info("Mealie profile written to %s", path)
+        return path
+
+
+def _write_report(
+    path: str,
+    duration: float,
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot,
+) -> None:
+    """Write the timings and allocations of the integration's code."""
+    timings = io.StringIO()
+    stats = pstats.Stats(profiler, stream=timings)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(PACKAGE_PATH, REPORT_LIMIT)
+
+    allocations = snapshot.filter_traces(
+        [tracemalloc.Filter(True, f"{PACKAGE_PATH}/*", all_frames=True)]
+    ).statistics("lineno")
+
+    with open(path, "w", encoding="utf-8") as report:
+        report.write(f"Mealie profile of {duration} seconds\n\n")
+        report.write("Timings\n=======\n")
+        report.write(timings.getvalue())
+        report.write("\nAllocations\n===========\n")
+        for statistic in allocations[:REPORT_LIMIT]:
+            report.write(f"{statistic}\n")
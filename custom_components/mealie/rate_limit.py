@@ -0,0 +1,87 @@
+"""Client side rate limiting for the Mealie API."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_POLL = 1
+PRIORITY_PREFETCH = 2
+
+
+class RateLimiter:
+    """Token bucket handing out tokens to waiting requests by priority.
+
+    Requests are let through while tokens are available, refilled at rate
+    per second up to burst. Otherwise they queue, and as tokens come back
+    interactive requests go first, then polling, then prefetching.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._peak_queue_depth = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting."""
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def pop_peak_queue_depth(self) -> int:
+        """Return the highest queue depth since last called."""
+        peak, self._peak_queue_depth = self._peak_queue_depth, self.queue_depth
+        return peak
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    async def acquire(self, priority: int) -> None:
+        """Wait for a token."""
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._peak_queue_depth = max(self._peak_queue_depth, len(self._waiters))
+        self._schedule()
+
+        await future
+
+    def _schedule(self) -> None:
+        """Schedule the release of the next token."""
+        if self._timer is not None or not self._waiters:
+            return
+
+        delay = max(0.0, (1 - self._tokens) / self._rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self) -> None:
+        """Hand out available tokens to the waiters first in line."""
+        self._timer = None
+        self._refill()
+
+        while self._waiters and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():
+                # Cancelled while waiting
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        self._schedule()
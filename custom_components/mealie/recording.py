@@ -0,0 +1,210 @@
+"""Record Mealie API exchanges to fixtures, and replay them offline."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import Counter
+from collections.abc import Awaitable, Generator
+from itertools import cycle
+from typing import Any
+
+from yarl import URL
+
+FIXTURE_VERSION = 1
+EXCHANGES_PER_ENDPOINT = 20
+REDACTED = "**REDACTED**"
+REDACTED_HOST = "mealie.invalid"
+REDACT_KEYS = {
+    "email",
+    "username",
+    "fullName",
+    "password",
+    "token",
+    "apiKey",
+    "groupSlug",
+    "householdSlug",
+}
+
+
+class ApiRecorder:
+    """Keep the exchanges of an API client, redacted, to write as a fixture.
+
+    Only the path below the base url is kept, headers are not, and values of
+    personal keys and the server's host are replaced wherever they appear.
+    """
+
+    def __init__(self, base: URL) -> None:
+        """Initialize."""
+        self._base = base
+        self._exchanges: list[dict] = []
+        self._per_endpoint: Counter[tuple[str, str]] = Counter()
+        self.server_version: str | None = None
+
+    def __len__(self) -> int:
+        """Return the number of exchanges recorded."""
+        return len(self._exchanges)
+
+    def record(
+        self,
+        method: str,
+        url: URL,
+        request: Any,
+        status: int | str,
+        response: Any,
+        latency: float,
+    ) -> None:
+        """Record an exchange, unless its endpoint has enough of them.
+
+        The data of a get is its query.
+        """
+        path = url.path.removeprefix(self._base.path)
+        query = dict(url.query)
+        if method == "get":
+            query.update(request or {})
+            request = None
+        if self._per_endpoint[(method, path)] >= EXCHANGES_PER_ENDPOINT:
+            return
+        self._per_endpoint[(method, path)] += 1
+
+        self._exchanges.append(
+            {
+                "method": method,
+                "path": self._redact(path),
+                "query": self._redact(query),
+                "request": self._redact(request),
+                "status": status,
+                "response": self._redact(response),
+                "latency": round(latency, 4),
+            }
+        )
+
+    def _redact(self, value: Any) -> Any:
+        """Return value with personal data and the host replaced."""
+        if isinstance(value, dict):
+            return {
+                key: REDACTED if key in REDACT_KEYS else self._redact(item)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self._redact(item) for item in value]
+        if isinstance(value, str) and self._base.host:
+            return value.replace(self._base.host, REDACTED_HOST)
+        return value
+
+    def save(self, path: str) -> None:
+        """Write the recorded exchanges as a fixture, this does blocking I/O."""
+        with open(path, "w", encoding="utf-8") as fixture:
+            json.dump(
+                {
+                    "version": FIXTURE_VERSION,
+                    "server_version": self.server_version,
+                    "exchanges": self._exchanges,
+                },
+                fixture,
+                indent=2,
+            )
+
+
+def load_fixture(path: str) -> dict:
+    """Read a fixture written by ApiRecorder, this does blocking I/O."""
+    with open(path, encoding="utf-8") as fixture:
+        data = json.load(fixture)
+    if data.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Unsupported fixture version {data.get('version')}")
+    return data
+
+
+class ReplayResponse:
+    """A recorded response, answering like an aiohttp response."""
+
+    def __init__(self, status: int | str, body: Any) -> None:
+        """Initialize."""
+        self.status = status
+        self.content_length = None
+        self._body = body
+
+    async def json(self) -> Any:
+        """Return the recorded body."""
+        return self._body
+
+    async def read(self) -> bytes:
+        """Return the recorded body as bytes."""
+        return json.dumps(self._body).encode()
+
+
+class ReplayRequest:
+    """A replayed request, awaited or entered like an aiohttp request."""
+
+    def __init__(self, response: Awaitable[ReplayResponse]) -> None:
+        """Initialize."""
+        self._response = response
+
+    def __await__(self) -> Generator[Any, None, ReplayResponse]:
+        """Return the response."""
+        return self._response.__await__()
+
+    async def __aenter__(self) -> ReplayResponse:
+        """Return the response."""
+        return await self._response
+
+    async def __aexit__(self, *args) -> None:
+        """Nothing to release."""
+
+
+class ReplaySession:
+    """Serve recorded exchanges in place of an aiohttp session.
+
+    Requests are matched on method, path and query, falling back to method and
+    path as dates in queries move on, and endpoints recorded more than once
+    answer with each of their recordings in turn. Recorded latencies are
+    slept, scaled by speed.
+    """
+
+    def __init__(
+        self, fixture: dict, base: URL | None = None, speed: float = 1
+    ) -> None:
+        """Initialize."""
+        self._base = base or URL(f"http://{REDACTED_HOST}/")
+        self._speed = speed
+        by_query: dict[tuple, list[dict]] = {}
+        by_path: dict[tuple, list[dict]] = {}
+        for exchange in fixture["exchanges"]:
+            key = (exchange["method"], exchange["path"])
+            query = tuple(sorted(exchange["query"].items()))
+            by_query.setdefault((*key, query), []).append(exchange)
+            by_path.setdefault(key, []).append(exchange)
+        self._by_query = {key: cycle(value) for key, value in by_query.items()}
+        self._by_path = {key: cycle(value) for key, value in by_path.items()}
+        self.unmatched: Counter[str] = Counter()
+
+    async def _replay(
+        self, method: str, url: URL | str, params: dict | None
+    ) -> ReplayResponse:
+        url = URL(url).update_query(params or {})
+        key = (method, url.path.removeprefix(self._base.path))
+        exchanges = self._by_query.get((*key, tuple(sorted(url.query.items()))))
+        if exchanges is None and (exchanges := self._by_path.get(key)) is None:
+            self.unmatched[f"{method} {key[1]}"] += 1
+            return ReplayResponse(404, {"detail": "Not recorded"})
+
+        exchange = next(exchanges)
+        if self._speed:
+            await asyncio.sleep(exchange["latency"] / self._speed)
+        return ReplayResponse(exchange["status"], exchange["response"])
+
+    def get(self, url, params=None, **kwargs) -> ReplayRequest:
+        """Replay a get."""
+        return ReplayRequest(self._replay("get", url, params))
+
+    def put(self, url, **kwargs) -> ReplayRequest:
+        """Replay a put."""
+        return ReplayRequest(self._replay("put", url, None))
+
+    def post(self, url, **kwargs) -> ReplayRequest:
+        """Replay a post."""
+        return ReplayRequest(self._replay("post", url, None))
+
+    def delete(self, url, **kwargs) -> ReplayRequest:
+        """Replay a delete."""
+        return ReplayRequest(self._replay("delete", url, None))
@@ -2,17 +2,37 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
+    SensorStateClass,
 )
+from homeassistant.const import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, COORDINATOR, ATTR_RECIPE_URL
+from .const import (
+    DOMAIN,
+    DOMAIN_CONFIG,
+    COORDINATOR,
+    MEAL_TYPES,
+    CONF_MEAL_DAY_OFFSETS,
+    ATTR_RECIPE_URL,
+    ATTR_DESCRIPTION,
+    ATTR_INGREDIENTS,
+    ATTR_PREP_TIME,
+    ATTR_COOK_TIME,
+    ATTR_TOTAL_TIME,
+    ATTR_SERVINGS,
+)
 from .entity import MealieEntity
-from .coordinator import MealieDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
 
 
 ENTITY_DESCRIPTIONS = (
@@ -35,6 +55,90 @@ ENTITY_DESCRIPTIONS = (
 )
 
 
+@dataclass(frozen=True, kw_only=True)
+class MealieMealSensorEntityDescription(SensorEntityDescription):
+    """Describes a Mealie sensor for a meal on a later day."""
+
+    entry_type: str
+    day_offset: int
+
+
+def _meal_entity_descriptions(
+    day_offsets: list[int],
+) -> list[MealieMealSensorEntityDescription]:
+    """Return the descriptions of the sensors for meals on later days."""
+    descriptions = []
+    for day_offset in day_offsets:
+        for entry_type in MEAL_TYPES:
+            if day_offset == 1:
+                key = f"tomorrows_{entry_type}"
+                translation_key = key
+            else:
+                key = f"{entry_type}_in_{day_offset}_days"
+                translation_key = f"{entry_type}_in_days"
+            descriptions.append(
+                MealieMealSensorEntityDescription(
+                    key=key,
+                    translation_key=translation_key,
+                    translation_placeholders={"days": str(day_offset)},
+                    entry_type=entry_type,
+                    day_offset=day_offset,
+                )
+            )
+    return descriptions
+
+
+API_QUEUE_DEPTH_DESCRIPTION = SensorEntityDescription(
+    key="api_queue_depth",
+    translation_key="api_queue_depth",
+    entity_category=EntityCategory.DIAGNOSTIC,
+    state_class=SensorStateClass.MEASUREMENT,
+    entity_registry_enabled_default=False,
+    icon="mdi:tray-full",
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MealieUncheckedItemsSensorEntityDescription(SensorEntityDescription):
+    """Describes a Mealie sensor counting unchecked items of lists or a label."""
+
+    shopping_list_id: str | None = None
+    label_id: str | None = None
+    state_class: SensorStateClass = SensorStateClass.MEASUREMENT
+    icon: str = "mdi:cart-outline"
+
+
+UNCHECKED_ITEMS_DESCRIPTION = MealieUncheckedItemsSensorEntityDescription(
+    key="unchecked_items",
+    translation_key="unchecked_items",
+)
+
+
+def _unchecked_items_descriptions(
+    shopping_lists: list[dict], labels: list[dict]
+) -> list[MealieUncheckedItemsSensorEntityDescription]:
+    """Return the descriptions of the sensors for each list and label."""
+    descriptions = [
+        MealieUncheckedItemsSensorEntityDescription(
+            key=f"unchecked_items_{shopping_list['id']}",
+            translation_key="shopping_list_unchecked_items",
+            translation_placeholders={"name": shopping_list["name"]},
+            shopping_list_id=shopping_list["id"],
+        )
+        for shopping_list in shopping_lists
+    ]
+    descriptions.extend(
+        MealieUncheckedItemsSensorEntityDescription(
+            key=f"unchecked_items_label_{label['id']}",
+            translation_key="label_unchecked_items",
+            translation_placeholders={"label": label["name"]},
+            label_id=label["id"],
+        )
+        for label in labels
+    )
+    return descriptions
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -42,6 +146,7 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     coordinator: MealieDataUpdateCoordinator = hass.data[DOMAIN][COORDINATOR]
+    domain_config = hass.data[DOMAIN][DOMAIN_CONFIG]
 
     async_add_entities(
         MealieSensor(
@@ -51,13 +156,70 @@ async def async_setup_entry(
         for entity_description in ENTITY_DESCRIPTIONS
     )
 
+    async_add_entities(
+        MealieMealSensor(
+            entity_description=entity_description,
+            coordinator=coordinator,
+        )
+        for entity_description in _meal_entity_descriptions(
+            domain_config[CONF_MEAL_DAY_OFFSETS]
+        )
+    )
+
+    async_add_entities(
+        MealieUncheckedItemsSensor(
+            entity_description=entity_description,
+            coordinator=coordinator,
+        )
+        for entity_description in [
+            UNCHECKED_ITEMS_DESCRIPTION,
+            *_unchecked_items_descriptions(
+                await coordinator.async_get_shopping_lists(), []
+            ),
+        ]
+    )
+
+    async def _async_add_label_sensors() -> None:
+        """Add the sensors for each label once the labels are fetched."""
+        if labels := await coordinator.async_get_labels():
+            async_add_entities(
+                MealieUncheckedItemsSensor(
+                    entity_description=entity_description,
+                    coordinator=coordinator,
+                )
+                for entity_description in _unchecked_items_descriptions([], labels)
+            )
+
+    # Labels are not fetched by refreshes, so startup does not wait for them
+    entry.async_create_background_task(
+        hass, _async_add_label_sensors(), f"{DOMAIN} label sensors"
+    )
+
+    async_add_entities(
+        [
+            MealieApiQueueSensor(
+                entity_description=API_QUEUE_DEPTH_DESCRIPTION,
+                coordinator=coordinator,
+            )
+        ]
+    )
+
 
 class MealieSensor(MealieEntity, SensorEntity):
     """Mealie Sensor class."""
 
     entity_description: SensorEntityDescription
 
-    _native_value = None
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_DESCRIPTION,
+            ATTR_INGREDIENTS,
+            ATTR_PREP_TIME,
+            ATTR_COOK_TIME,
+            ATTR_TOTAL_TIME,
+            ATTR_SERVINGS,
+        }
+    )
 
     def __init__(
         self,
@@ -79,46 +241,135 @@ class MealieSensor(MealieEntity, SensorEntity):
         """Handle added to Hass."""
         await super().async_added_to_hass()
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-
-        super()._handle_coordinator_update()
+    def _meal(self) -> str | None:
+        """Return the meal."""
+        if self.entity_description.key == "todays_breakfast":
+            return self.coordinator.todays_breakfast()
+        if self.entity_description.key == "todays_lunch":
+            return self.coordinator.todays_lunch()
+        if self.entity_description.key == "todays_dinner":
+            return self.coordinator.todays_dinner()
+        if self.entity_description.key == "todays_side":
+            return self.coordinator.todays_side()
+        return None
 
+    def _recipe_url(self) -> str | None:
+        """Return the url of the meal's recipe."""
         if self.entity_description.key == "todays_breakfast":
-            self._native_value = self.coordinator.todays_breakfast()
+            return self.coordinator.todays_breakfast_recipe_url()
         if self.entity_description.key == "todays_lunch":
-            self._native_value = self.coordinator.todays_lunch()
+            return self.coordinator.todays_lunch_recipe_url()
         if self.entity_description.key == "todays_dinner":
-            self._native_value = self.coordinator.todays_dinner()
+            return self.coordinator.todays_dinner_recipe_url()
         if self.entity_description.key == "todays_side":
-            self._native_value = self.coordinator.todays_side()
+            return self.coordinator.todays_side_recipe_url()
+        return None
 
-        self.async_write_ha_state()
+    def _recipe_details(self) -> dict:
+        """Return the details of the meal's recipe."""
+        return self.coordinator.todays_recipe_details(
+            self.entity_description.key.removeprefix("todays_")
+        )
 
     @property
     def native_value(self) -> str | None:
-        """Return the native value of the sensor."""
-        return self._native_value
+        """Return the native value of the sensor, from the coordinator's data."""
+        return self._meal()
 
     @property
     def extra_state_attributes(self) -> dict[str, str] | None:
         """Return the state attributes."""
 
-        if self.entity_description.key == "todays_breakfast":
-            url = self.coordinator.todays_breakfast_recipe_url()
-        if self.entity_description.key == "todays_lunch":
-            url = self.coordinator.todays_lunch_recipe_url()
-        if self.entity_description.key == "todays_dinner":
-            url = self.coordinator.todays_dinner_recipe_url()
-        if self.entity_description.key == "todays_side":
-            url = self.coordinator.todays_side_recipe_url()
-
         attrs = {
-            ATTR_RECIPE_URL: url,
+            ATTR_RECIPE_URL: self._recipe_url(),
         }
+        attrs.update(self._recipe_details())
 
         super_attrs = super().extra_state_attributes
         if super_attrs:
             attrs.update(super_attrs)
         return attrs
+
+
+class MealieMealSensor(MealieSensor):
+    """Mealie Sensor class for a meal on a later day."""
+
+    entity_description: MealieMealSensorEntityDescription
+
+    def _meal(self) -> str | None:
+        """Return the meal."""
+        return self.coordinator.meal(
+            self.entity_description.entry_type, self.entity_description.day_offset
+        )
+
+    def _recipe_url(self) -> str | None:
+        """Return the url of the meal's recipe."""
+        return self.coordinator.meal_recipe_url(
+            self.entity_description.entry_type, self.entity_description.day_offset
+        )
+
+    def _recipe_details(self) -> dict:
+        """Return the details of the meal's recipe, only cached for today."""
+        return {}
+
+
+class MealieApiQueueSensor(MealieEntity, SensorEntity):
+    """Mealie Sensor class for the depth of the API request queue."""
+
+    def __init__(
+        self,
+        entity_description: SensorEntityDescription,
+        coordinator: MealieDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(entity_description, coordinator)
+
+        self._attr_should_poll = False
+        self.entity_id = f"sensor.mealie_{entity_description.key}"
+        self._attr_unique_id = f"mealie_{entity_description.key}".lower()
+        self._attr_native_value = 0
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._attr_native_value = (
+            self.coordinator.api.rate_limiter.pop_peak_queue_depth()
+        )
+        super()._handle_coordinator_update()
+
+    def _state_signature(self) -> tuple:
+        """Return what the state is worked out from, the queue depth."""
+        return (self.available, self.coordinator.stale, self._attr_native_value)
+
+
+class MealieUncheckedItemsSensor(MealieEntity, SensorEntity):
+    """Mealie Sensor class for the unchecked items of lists or a label.
+
+    The coordinator keeps the counts as items change, so reading one is
+    cheap, and the state is only written when it changes.
+    """
+
+    entity_description: MealieUncheckedItemsSensorEntityDescription
+
+    def __init__(
+        self,
+        entity_description: MealieUncheckedItemsSensorEntityDescription,
+        coordinator: MealieDataUpdateCoordinator,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(entity_description, coordinator)
+
+        self._attr_should_poll = False
+        self._attr_unique_id = f"mealie_{entity_description.key}".lower()
+
+    def _state_signature(self) -> tuple:
+        """Return what the state is worked out from, the count of items."""
+        return (self.available, self.coordinator.stale, self.native_value)
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of unchecked items."""
+        return self.coordinator.unchecked_item_count(
+            self.entity_description.shopping_list_id,
+            self.entity_description.label_id,
+        )
@@ -0,0 +1,380 @@
+"""Services for Mealie."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    COORDINATOR,
+    SERVICE_ADD_SHOPPING_LIST_ITEM,
+    SERVICE_ADD_SHOPPING_LIST_ITEM_IF_MISSING,
+    SERVICE_CHECK_ALL_ITEMS,
+    SERVICE_UNCHECK_ALL_ITEMS,
+    SERVICE_ADD_RECIPE_TO_SHOPPING_LIST,
+    SERVICE_PROFILE,
+    ATTR_SHOPPING_LIST_ID,
+    ATTR_ITEM,
+    ATTR_ITEMS,
+    ATTR_NOTE,
+    ATTR_QUANTITY,
+    ATTR_UNIT,
+    ATTR_LABEL,
+    ATTR_RECIPE_SLUG,
+    ATTR_MEAL_PLAN_ID,
+    ATTR_FOOD_ID,
+    ATTR_ADDED,
+    ATTR_ITEM_ID,
+    ATTR_DURATION,
+    ATTR_PATH,
+)
+from .api import returned_items
+from .merge import merge_ingredients
+from .profiling import MealieProfiler
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
+
+ITEM_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_NOTE): cv.string,
+        vol.Optional(ATTR_QUANTITY): vol.Coerce(float),
+        vol.Optional(ATTR_UNIT): cv.string,
+        vol.Optional(ATTR_LABEL): cv.string,
+    }
+)
+
+SERVICE_ADD_SHOPPING_LIST_ITEM_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_SHOPPING_LIST_ID): cv.string,
+            vol.Optional(ATTR_ITEM): cv.string,
+            vol.Optional(ATTR_ITEMS): vol.All(
+                cv.ensure_list, [vol.Any(ITEM_SCHEMA, cv.string)]
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ITEM, ATTR_ITEMS),
+)
+
+SERVICE_ADD_SHOPPING_LIST_ITEM_IF_MISSING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SHOPPING_LIST_ID): cv.string,
+        vol.Required(ATTR_ITEM): cv.string,
+        vol.Optional(ATTR_QUANTITY): vol.Coerce(float),
+        vol.Optional(ATTR_UNIT): cv.string,
+        vol.Optional(ATTR_LABEL): cv.string,
+        vol.Optional(ATTR_FOOD_ID): cv.string,
+    }
+)
+
+SERVICE_CHECK_ALL_ITEMS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SHOPPING_LIST_ID): cv.string,
+        vol.Optional(ATTR_LABEL): cv.string,
+    }
+)
+
+SERVICE_ADD_RECIPE_TO_SHOPPING_LIST_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_SHOPPING_LIST_ID): cv.string,
+            vol.Exclusive(ATTR_RECIPE_SLUG, "recipe"): cv.string,
+            vol.Exclusive(ATTR_MEAL_PLAN_ID, "recipe"): cv.string,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_RECIPE_SLUG, ATTR_MEAL_PLAN_ID),
+)
+
+SERVICE_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=60): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+    }
+)
+
+
+def _get_coordinator(
+    hass: HomeAssistant, shopping_list_id: str
+) -> MealieDataUpdateCoordinator:
+    """Return the coordinator, validating the shopping list exists."""
+    coordinator: MealieDataUpdateCoordinator | None = hass.data[DOMAIN].get(
+        COORDINATOR
+    )
+    if coordinator is None:
+        raise ServiceValidationError("Mealie is not set up")
+
+    if shopping_list_id not in coordinator.shopping_list_items:
+        raise ServiceValidationError(f"Unknown shopping list {shopping_list_id}")
+
+    return coordinator
+
+
+async def _async_get_ids(
+    coordinator: MealieDataUpdateCoordinator, requested: list[dict]
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Return the ids of units and labels, if any of the items need them."""
+    unit_ids = {}
+    if any(ATTR_UNIT in item for item in requested):
+        unit_ids = await coordinator.async_get_unit_ids()
+    label_ids = {}
+    if any(ATTR_LABEL in item for item in requested):
+        label_ids = await coordinator.async_get_label_ids()
+    return unit_ids, label_ids
+
+
+def _item_data(
+    shopping_list_id: str,
+    item: dict,
+    position: int,
+    unit_ids: dict[str, str],
+    label_ids: dict[str, str],
+) -> dict:
+    """Return the data to create a shopping list item from a service call."""
+    data = {
+        "isFood": False,
+        "checked": False,
+        "note": item[ATTR_NOTE],
+        "shoppingListId": shopping_list_id,
+        "position": position,
+    }
+    if ATTR_QUANTITY in item:
+        data["quantity"] = item[ATTR_QUANTITY]
+    if ATTR_UNIT in item:
+        if (unit_id := unit_ids.get(item[ATTR_UNIT].casefold())) is None:
+            raise ServiceValidationError(f"Unknown unit {item[ATTR_UNIT]}")
+        data["unitId"] = unit_id
+    if ATTR_LABEL in item:
+        if (label_id := label_ids.get(item[ATTR_LABEL].casefold())) is None:
+            raise ServiceValidationError(f"Unknown label {item[ATTR_LABEL]}")
+        data["labelId"] = label_id
+    if ATTR_FOOD_ID in item:
+        data["isFood"] = True
+        data["foodId"] = item[ATTR_FOOD_ID]
+    return data
+
+
+async def _async_add_shopping_list_item(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Add one or more items to a shopping list with a single request."""
+    shopping_list_id = call.data[ATTR_SHOPPING_LIST_ID]
+    coordinator = _get_coordinator(hass, shopping_list_id)
+
+    requested = []
+    if ATTR_ITEM in call.data:
+        requested.append({ATTR_NOTE: call.data[ATTR_ITEM]})
+    for item in call.data.get(ATTR_ITEMS, []):
+        requested.append(item if isinstance(item, dict) else {ATTR_NOTE: item})
+
+    unit_ids, label_ids = await _async_get_ids(coordinator, requested)
+
+    async with coordinator.shopping_list_lock(shopping_list_id):
+        position = coordinator.next_shopping_list_position(shopping_list_id)
+        items = []
+        for item in requested:
+            items.append(
+                _item_data(shopping_list_id, item, position, unit_ids, label_ids)
+            )
+            position += 1
+
+        result = await coordinator.async_write_shopping_list(
+            shopping_list_id,
+            coordinator.api.async_add_shopping_list_items(items, raise_errors=True),
+            f"Unable to add items to shopping list {shopping_list_id}",
+        )
+
+        await coordinator.async_apply_shopping_list_result(shopping_list_id, result)
+
+
+async def _async_add_shopping_list_item_if_missing(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Add an item to a shopping list unless an unchecked item matches it.
+
+    Matching is done against the items already fetched, so only an item that
+    is missing costs a request.
+    """
+    shopping_list_id = call.data[ATTR_SHOPPING_LIST_ID]
+    coordinator = _get_coordinator(hass, shopping_list_id)
+    requested = {ATTR_NOTE: call.data[ATTR_ITEM], **call.data}
+
+    unit_ids, label_ids = await _async_get_ids(coordinator, [requested])
+
+    async with coordinator.shopping_list_lock(shopping_list_id):
+        item = coordinator.find_shopping_list_item(
+            shopping_list_id, call.data[ATTR_ITEM], call.data.get(ATTR_FOOD_ID)
+        )
+        if item is not None:
+            return {ATTR_ADDED: False, ATTR_ITEM_ID: item["id"]}
+
+        data = _item_data(
+            shopping_list_id,
+            requested,
+            coordinator.next_shopping_list_position(shopping_list_id),
+            unit_ids,
+            label_ids,
+        )
+        result = await coordinator.async_write_shopping_list(
+            shopping_list_id,
+            coordinator.api.async_add_shopping_list_items([data], raise_errors=True),
+            f"Unable to add items to shopping list {shopping_list_id}",
+        )
+
+        await coordinator.async_apply_shopping_list_result(shopping_list_id, result)
+
+    # The server may merge the item into one it matches, returning it as updated
+    written = returned_items(result, "createdItems") or returned_items(
+        result, "updatedItems"
+    )
+    return {ATTR_ADDED: True, ATTR_ITEM_ID: written[0]["id"] if written else None}
+
+
+async def _async_set_all_items_checked(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Check or uncheck all items of a shopping list with a single request."""
+    shopping_list_id = call.data[ATTR_SHOPPING_LIST_ID]
+    coordinator = _get_coordinator(hass, shopping_list_id)
+    checked = call.service == SERVICE_CHECK_ALL_ITEMS
+
+    label_id = None
+    if ATTR_LABEL in call.data:
+        label_ids = await coordinator.async_get_label_ids()
+        if (label_id := label_ids.get(call.data[ATTR_LABEL].casefold())) is None:
+            raise ServiceValidationError(f"Unknown label {call.data[ATTR_LABEL]}")
+
+    async with coordinator.shopping_list_lock(shopping_list_id):
+        items = [
+            {**item, "checked": checked}
+            for item in coordinator.shopping_list_items[shopping_list_id]
+            if item["checked"] != checked
+            and (label_id is None or item.get("labelId") == label_id)
+        ]
+        if not items:
+            return
+
+        result = await coordinator.async_write_shopping_list(
+            shopping_list_id,
+            coordinator.api.async_update_shopping_list_items(items, raise_errors=True),
+            f"Unable to update items on shopping list {shopping_list_id}",
+        )
+
+        await coordinator.async_apply_shopping_list_result(shopping_list_id, result)
+
+
+async def _async_add_recipe_to_shopping_list(
+    hass: HomeAssistant, call: ServiceCall
+) -> None:
+    """Merge a recipe's ingredients into a shopping list."""
+    shopping_list_id = call.data[ATTR_SHOPPING_LIST_ID]
+    coordinator = _get_coordinator(hass, shopping_list_id)
+
+    if ATTR_MEAL_PLAN_ID in call.data:
+        recipe_slug = await coordinator.async_get_meal_plan_recipe_slug(
+            call.data[ATTR_MEAL_PLAN_ID]
+        )
+        if recipe_slug is None:
+            raise ServiceValidationError(
+                f"Meal plan entry {call.data[ATTR_MEAL_PLAN_ID]} has no recipe"
+            )
+    else:
+        recipe_slug = call.data[ATTR_RECIPE_SLUG]
+
+    if (recipe := await coordinator.async_get_recipe(recipe_slug)) is None:
+        raise ServiceValidationError(f"Unknown recipe {recipe_slug}")
+
+    async with coordinator.shopping_list_lock(shopping_list_id):
+        to_create, to_update = merge_ingredients(
+            shopping_list_id,
+            recipe.get("recipeIngredient") or [],
+            coordinator.shopping_list_items[shopping_list_id],
+            coordinator.next_shopping_list_position(shopping_list_id),
+        )
+
+        # Updates go first, as the server may merge created items into those
+        # updated, adding to the quantities written rather than being undone
+        if to_update:
+            result = await coordinator.async_write_shopping_list(
+                shopping_list_id,
+                coordinator.api.async_update_shopping_list_items(
+                    to_update, raise_errors=True
+                ),
+                f"Unable to update items on shopping list {shopping_list_id}",
+            )
+            await coordinator.async_apply_shopping_list_result(shopping_list_id, result)
+        if to_create:
+            result = await coordinator.async_write_shopping_list(
+                shopping_list_id,
+                coordinator.api.async_add_shopping_list_items(
+                    to_create, raise_errors=True
+                ),
+                f"Unable to add items to shopping list {shopping_list_id}",
+            )
+            await coordinator.async_apply_shopping_list_result(shopping_list_id, result)
+
+
+async def _async_profile(
+    profiler: MealieProfiler, call: ServiceCall
+) -> ServiceResponse:
+    """Profile the integration and write a report to the config directory."""
+    path = await profiler.async_profile(call.data[ATTR_DURATION])
+    return {ATTR_PATH: path}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the Mealie services."""
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_SHOPPING_LIST_ITEM,
+        partial(_async_add_shopping_list_item, hass),
+        schema=SERVICE_ADD_SHOPPING_LIST_ITEM_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_SHOPPING_LIST_ITEM_IF_MISSING,
+        partial(_async_add_shopping_list_item_if_missing, hass),
+        schema=SERVICE_ADD_SHOPPING_LIST_ITEM_IF_MISSING_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CHECK_ALL_ITEMS,
+        partial(_async_set_all_items_checked, hass),
+        schema=SERVICE_CHECK_ALL_ITEMS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UNCHECK_ALL_ITEMS,
+        partial(_async_set_all_items_checked, hass),
+        schema=SERVICE_CHECK_ALL_ITEMS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ADD_RECIPE_TO_SHOPPING_LIST,
+        partial(_async_add_recipe_to_shopping_list, hass),
+        schema=SERVICE_ADD_RECIPE_TO_SHOPPING_LIST_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        partial(_async_profile, MealieProfiler(hass)),
+        schema=SERVICE_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -1,5 +1,9 @@
 """A Mealie todo platform."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from homeassistant.components.todo import (
     TodoItem,
     TodoItemStatus,
@@ -10,9 +14,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, LOGGER, COORDINATOR, ATTR_SHOPPING_LIST_ID
+from .const import DOMAIN, LOGGER, COORDINATOR, ATTR_SHOPPING_LIST_ID, ATTR_STALE
 from .entity import MealieEntity
-from .coordinator import MealieDataUpdateCoordinator
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
 
 
 TODO_STATUS_MAP = {
@@ -113,58 +119,55 @@ class MealieTodoListEntity(MealieEntity, TodoListEntity):
 
         return []
 
-    async def async_added_to_hass(self) -> None:
-        """When entity is added to hass update state from existing coordinator data."""
-        await super().async_added_to_hass()
-
-        await self.coordinator.async_refresh()
-
-        self._handle_coordinator_update()
-
     async def async_create_todo_item(self, item: TodoItem) -> None:
         """Add an item to the list."""
 
-        position = 0
-        if len(self.coordinator.shopping_list_items[self._shopping_list_id]) > 0:
-            position = (
-                self.coordinator.shopping_list_items[self._shopping_list_id][-1].get(
-                    "position"
-                )
-                + 1
+        async with self.coordinator.shopping_list_lock(self._shopping_list_id):
+            position = self.coordinator.next_shopping_list_position(
+                self._shopping_list_id
             )
 
-        await self.coordinator.api.async_add_shopping_list_item(
-            self._shopping_list_id, item.summary, position
-        )
-        await self.coordinator.async_refresh()
+            result = await self.coordinator.async_write_shopping_list(
+                self._shopping_list_id,
+                self.coordinator.api.async_add_shopping_list_item(
+                    self._shopping_list_id, item.summary, position, raise_errors=True
+                ),
+                f"Unable to add an item to shopping list {self._shopping_list_id}",
+            )
+            await self.coordinator.async_apply_shopping_list_result(
+                self._shopping_list_id, result
+            )
 
     async def async_update_todo_item(self, item: TodoItem) -> None:
         """Update an item on the list."""
 
         list_items = self.coordinator.shopping_list_items[self._shopping_list_id]
 
-        for list_item in list_items:
-            if list_item["id"] == item.uid:
-                position = list_item["position"]
-                break
-
-        list_items = self.coordinator.shopping_list_items[self._shopping_list_id]
         for list_item in list_items:
             if list_item["id"] == item.uid:
                 if list_item["display"] == item.summary:
-                    list_item["checked"] = item.status == TodoItemStatus.COMPLETED
+                    list_item = {
+                        **list_item,
+                        "checked": item.status == TodoItemStatus.COMPLETED,
+                    }
                 else:
-                    list_item["note"] = item.summary
-                    list_item["position"] = position
-                    list_item["isFood"] = "False"
-                    list_item["foodId"] = None
-                    list_item["quantity"] = "0.0"
-                    list_item["checked"] = item.status == TodoItemStatus.COMPLETED
-
-                await self.coordinator.api.async_update_shopping_list_item(
-                    self._shopping_list_id, item.uid, list_item
+                    list_item = {
+                        **list_item,
+                        "note": item.summary,
+                        "isFood": "False",
+                        "foodId": None,
+                        "quantity": "0.0",
+                        "checked": item.status == TodoItemStatus.COMPLETED,
+                        "display": item.summary,
+                    }
+
+                # Show the change now, the write is batched with any that follow
+                self.coordinator.get_write_queue(self._shopping_list_id).async_enqueue(
+                    list_item
+                )
+                self.coordinator.async_apply_shopping_list_changes(
+                    self._shopping_list_id, [list_item]
                 )
-                await self.coordinator.async_refresh()
                 return
 
         LOGGER.error(
@@ -173,46 +176,68 @@ class MealieTodoListEntity(MealieEntity, TodoListEntity):
 
     async def async_delete_todo_items(self, uids: list[str]) -> None:
         """Delete items from the list."""
-        for uid in uids:
-            await self.coordinator.api.async_delete_shopping_list_item(uid)
-
-        await self.coordinator.async_refresh()
+        await self.coordinator.get_write_queue(self._shopping_list_id).async_flush()
+
+        async with self.coordinator.shopping_list_lock(self._shopping_list_id):
+            deleted = []
+            try:
+                for uid in uids:
+                    await self.coordinator.async_write_shopping_list(
+                        self._shopping_list_id,
+                        self.coordinator.api.async_delete_shopping_list_item(
+                            uid, raise_errors=True
+                        ),
+                        "Unable to delete items from shopping list "
+                        f"{self._shopping_list_id}",
+                    )
+                    deleted.append(uid)
+            finally:
+                self.coordinator.async_apply_shopping_list_changes(
+                    self._shopping_list_id, removed=deleted
+                )
 
     async def async_move_todo_item(
         self, uid: str, previous_uid: str | None = None
     ) -> None:
         """Re-order an item on the list."""
+        await self.coordinator.get_write_queue(self._shopping_list_id).async_flush()
 
-        list_items = self.coordinator.shopping_list_items[self._shopping_list_id]
-
-        old_uid_index = None
-        previous_uid_index = None
-
-        for item in list_items:
-            if item["id"] == uid:
-                old_uid_index = list_items.index(item)
-                item_to_move = item
-            if previous_uid and item["id"] == previous_uid:
-                previous_uid_index = list_items.index(item)
-            if old_uid_index and previous_uid_index:
-                break
-
-        if previous_uid is None:
-            previous_uid_index = -1
-
-        if previous_uid_index < old_uid_index:
-            previous_uid_index += 1
-
-        list_items.pop(old_uid_index)
-        list_items.insert(previous_uid_index, item_to_move)
+        async with self.coordinator.shopping_list_lock(self._shopping_list_id):
+            list_items = list(
+                self.coordinator.shopping_list_items[self._shopping_list_id]
+            )
 
-        position = 0
-        for item in list_items:
-            await self.coordinator.api.async_reorder_shopping_list_item(
-                self._shopping_list_id, item, position
+            old_uid_index = None
+            previous_uid_index = None
+
+            for item in list_items:
+                if item["id"] == uid:
+                    old_uid_index = list_items.index(item)
+                    item_to_move = item
+                if previous_uid and item["id"] == previous_uid:
+                    previous_uid_index = list_items.index(item)
+                if old_uid_index and previous_uid_index:
+                    break
+
+            if previous_uid is None:
+                previous_uid_index = -1
+
+            if previous_uid_index < old_uid_index:
+                previous_uid_index += 1
+
+            list_items.pop(old_uid_index)
+            list_items.insert(previous_uid_index, item_to_move)
+
+            result = await self.coordinator.async_write_shopping_list(
+                self._shopping_list_id,
+                self.coordinator.api.async_reorder_shopping_list_items(
+                    self._shopping_list_id, list_items, raise_errors=True
+                ),
+                f"Unable to move an item on shopping list {self._shopping_list_id}",
+            )
+            await self.coordinator.async_apply_shopping_list_result(
+                self._shopping_list_id, result
             )
-            position += 1
-        await self.coordinator.async_refresh()
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -229,6 +254,24 @@ class MealieTodoListEntity(MealieEntity, TodoListEntity):
 
         super()._handle_coordinator_update()
 
+    def _state_signature(self) -> tuple:
+        """Return what the state is worked out from, the version of the items.
+
+        Stored lists are replaced whenever an item changes, so comparing
+        their version stands in for comparing every item.
+        """
+        return (
+            self.available,
+            self.coordinator.stale,
+            self._shopping_list_id in self.coordinator.stale_shopping_lists,
+            self.coordinator.shopping_list_version(self._shopping_list_id),
+        )
+
+    @property
+    def state(self) -> int:
+        """Return the number of incomplete items, from the coordinator's counts."""
+        return self.coordinator.unchecked_item_count(self._shopping_list_id)
+
     @property
     def extra_state_attributes(self) -> dict[str, str] | None:
         """Return the state attributes of the shopping list."""
@@ -240,4 +283,6 @@ class MealieTodoListEntity(MealieEntity, TodoListEntity):
         super_attrs = super().extra_state_attributes
         if super_attrs:
             attrs.update(super_attrs)
+        if self._shopping_list_id in self.coordinator.stale_shopping_lists:
+            attrs[ATTR_STALE] = True
         return attrs
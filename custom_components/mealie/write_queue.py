@@ -0,0 +1,93 @@
+"""Write-behind queue for Mealie shopping list items."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+
+from .api import MealieApiError, MealieAuthError
+from .const import LOGGER, WRITE_QUEUE_DELAY
+
+if TYPE_CHECKING:
+    from .coordinator import MealieDataUpdateCoordinator
+
+
+class ShoppingListWriteQueue:
+    """Collapse rapid changes to the items of a shopping list into batched writes.
+
+    Only the latest change to an item within the window is written, and
+    flushes hold the list's lock so changes to an item are applied in order.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: MealieDataUpdateCoordinator,
+        shopping_list_id: str,
+    ) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self._shopping_list_id = shopping_list_id
+        self._pending: dict[str, dict] = {}
+        self._in_flight: dict[str, dict] = {}
+        self._debouncer = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=WRITE_QUEUE_DELAY,
+            immediate=False,
+            function=self.async_flush,
+        )
+
+    @callback
+    def async_enqueue(self, item: dict) -> None:
+        """Queue the latest state of an item to be written."""
+        self._pending[item["id"]] = item
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def async_overlay(self, items: list[dict]) -> list[dict]:
+        """Return items with queued and in flight changes applied."""
+        if not self._pending and not self._in_flight:
+            return items
+
+        changes = {**self._in_flight, **self._pending}
+        return [changes.get(item["id"], item) for item in items]
+
+    async def async_flush(self) -> None:
+        """Write all queued changes in one request."""
+        async with self._coordinator.shopping_list_lock(self._shopping_list_id):
+            if not self._pending:
+                return
+
+            self._in_flight = self._pending
+            self._pending = {}
+
+            try:
+                result = await self._coordinator.api.async_update_shopping_list_items(
+                    list(self._in_flight.values()), raise_errors=True
+                )
+            except MealieApiError as error:
+                LOGGER.warning(
+                    "Unable to write %s queued changes to shopping list %s (%s)",
+                    len(self._in_flight),
+                    self._shopping_list_id,
+                    error,
+                )
+                if isinstance(error, MealieAuthError):
+                    self._coordinator.config_entry.async_start_reauth(
+                        self._coordinator.hass
+                    )
+                result = None
+            finally:
+                self._in_flight = {}
+
+            await self._coordinator.async_apply_shopping_list_result(
+                self._shopping_list_id, result
+            )
+
+    async def async_shutdown(self) -> None:
+        """Write any queued changes and stop."""
+        self._debouncer.async_cancel()
+        await self.async_flush()
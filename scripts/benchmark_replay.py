@@ -0,0 +1,155 @@
+"""Benchmark Mealie refreshes offline against recorded server responses.
+
+Record a fixture from a real Mealie server, redacted of personal data and
+the server's address, then replay it with its recorded latencies as many
+times as needed. Each replayed refresh is timed end to end through the
+coordinator, so changes can be compared on production shaped data.
+
+    python3 scripts/benchmark_replay.py record --host http://mealie:9000 \
+        --token TOKEN mealie.fixture.json
+    python3 scripts/benchmark_replay.py replay mealie.fixture.json
+
+A fixture can also be recorded by Home Assistant itself, by setting
+`record: mealie.fixture.json` in the mealie section of configuration.yaml.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.mealie import CONFIG_SCHEMA  # noqa: E402
+from custom_components.mealie.api import MealieApiClient  # noqa: E402
+from custom_components.mealie.const import (  # noqa: E402
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    DOMAIN,
+    DOMAIN_CONFIG,
+)
+from custom_components.mealie.coordinator import (  # noqa: E402
+    MealieDataUpdateCoordinator,
+)
+from custom_components.mealie.recording import (  # noqa: E402
+    REDACTED_HOST,
+    ReplaySession,
+    load_fixture,
+)
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Return a percentile of the values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+async def _async_refreshes(
+    host: str, token: str, session, count: int, record: bool = False
+) -> tuple[MealieApiClient, list[float]]:
+    """Refresh a coordinator count times, returning the client and timings."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        domain_config = CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+        hass.data[DOMAIN] = {DOMAIN_CONFIG: domain_config}
+        config_entries.current_entry.set(
+            config_entries.ConfigEntry(
+                version=1,
+                minor_version=1,
+                domain=DOMAIN,
+                title="Mealie",
+                data={},
+                source=config_entries.SOURCE_USER,
+            )
+        )
+
+        api = MealieApiClient(
+            host=host,
+            token=token,
+            session=session,
+            rate_limit=domain_config[CONF_RATE_LIMIT],
+            rate_limit_burst=domain_config[CONF_RATE_LIMIT_BURST],
+            record=record,
+        )
+        await api.async_probe_capabilities()
+        coordinator = MealieDataUpdateCoordinator(hass, api, "benchmark")
+
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            timings.append((time.perf_counter() - started) * 1000)
+            if not coordinator.last_update_success:
+                raise SystemExit(f"Refresh failed ({coordinator.last_exception})")
+
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    return api, timings
+
+
+async def record(args) -> None:
+    """Record a fixture of refreshes from a real server."""
+    async with aiohttp.ClientSession() as session:
+        api, _ = await _async_refreshes(
+            args.host, args.token, session, args.refreshes, record=True
+        )
+    api.recorder.save(args.fixture)
+    sys.stdout.write(f"Recorded {len(api.recorder)} exchanges to {args.fixture}\n")
+
+
+async def replay(args) -> None:
+    """Replay a fixture and report the time refreshes take."""
+    fixture = load_fixture(args.fixture)
+    session = ReplaySession(fixture, speed=args.speed)
+    _, timings = await _async_refreshes(
+        f"http://{REDACTED_HOST}", "replay", session, args.refreshes
+    )
+
+    sys.stdout.write(
+        f"Mealie {fixture['server_version']}  "
+        f"{len(fixture['exchanges'])} exchanges  {args.refreshes} refreshes  "
+        f"p50 {_percentile(timings, 50):.1f}ms  "
+        f"p99 {_percentile(timings, 99):.1f}ms\n"
+    )
+    for request, count in session.unmatched.most_common():
+        sys.stdout.write(f"         not recorded: {request} ({count})\n")
+
+
+async def main() -> None:
+    """Record or replay a fixture."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="record a fixture")
+    record_parser.add_argument("--host", required=True)
+    record_parser.add_argument("--token", required=True)
+    record_parser.add_argument("--refreshes", type=int, default=3)
+    record_parser.add_argument("fixture")
+    record_parser.set_defaults(run=record)
+
+    replay_parser = commands.add_parser("replay", help="replay a fixture")
+    replay_parser.add_argument("--refreshes", type=int, default=20)
+    replay_parser.add_argument(
+        "--speed", type=float, default=1, help="latency divisor, 0 for none"
+    )
+    replay_parser.add_argument("fixture")
+    replay_parser.set_defaults(run=replay)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+    await args.run(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
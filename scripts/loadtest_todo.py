@@ -0,0 +1,414 @@
+"""Load test the Mealie to-do lists against a local fake Mealie server.
+
+Several simulated users create, check, rename, move and delete items on the
+same shopping list at once through MealieTodoListEntity. For each list size
+the mutation latency, the requests made per mutation, the items a quiet
+poll downloads and whether the final state matches what the users did are
+reported.
+
+    python3 scripts/loadtest_todo.py --sizes 10 100 1000 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import UTC, datetime
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.components.todo import TodoItem, TodoItemStatus  # noqa: E402
+from homeassistant.const import CONF_HOST  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.mealie import CONFIG_SCHEMA  # noqa: E402
+from custom_components.mealie.api import MealieApiClient  # noqa: E402
+from custom_components.mealie.const import (  # noqa: E402
+    CONF_RATE_LIMIT,
+    CONF_RATE_LIMIT_BURST,
+    DOMAIN,
+    DOMAIN_CONFIG,
+)
+from custom_components.mealie.coordinator import (  # noqa: E402
+    MealieDataUpdateCoordinator,
+)
+from custom_components.mealie.todo import MealieTodoListEntity  # noqa: E402
+
+SHOPPING_LIST_ID = "loadtest-list"
+MUTATIONS = {
+    "create": 25,
+    "check": 40,
+    "rename": 10,
+    "move": 15,
+    "delete": 10,
+}
+
+
+class FakeMealie:
+    """An in memory Mealie server with the shopping list endpoints."""
+
+    def __init__(self, size: int, latency: float, version: str) -> None:
+        """Initialize with a list of size items."""
+        self.latency = latency
+        self.version = version
+        self.requests: Counter[str] = Counter()
+        self.items_returned = 0
+        self.items: dict[str, dict] = {}
+        for position in range(size):
+            self._add({"note": f"seed-{position}", "position": position})
+
+    def _add(self, data: dict) -> dict:
+        item = {
+            "id": str(uuid.uuid4()),
+            "shoppingListId": SHOPPING_LIST_ID,
+            "checked": False,
+            "isFood": False,
+            "quantity": 0.0,
+            "foodId": None,
+            "unitId": None,
+            "labelId": None,
+            **data,
+        }
+        item["checked"] = item["checked"] in (True, "True")
+        item["display"] = item["note"]
+        item["updatedAt"] = datetime.now(UTC).isoformat()
+        self.items[item["id"]] = item
+        return item
+
+    def _update(self, data: dict) -> dict | None:
+        if (item := self.items.get(data.get("id") or data.get("item_id"))) is None:
+            return None
+        item.update({key: value for key, value in data.items() if key != "item_id"})
+        item["checked"] = item["checked"] in (True, "True")
+        item["display"] = item["note"]
+        item["updatedAt"] = datetime.now(UTC).isoformat()
+        return item
+
+    def application(self) -> web.Application:
+        """Return the web application serving the fake api."""
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/api/app/about", self._about)
+        for prefix in ("/api/groups", "/api/households"):
+            app.router.add_get(f"{prefix}/shopping/lists", self._get_lists)
+            app.router.add_get(f"{prefix}/shopping/items", self._get_items)
+            app.router.add_post(f"{prefix}/shopping/items", self._create_item)
+            app.router.add_post(f"{prefix}/shopping/items/create-bulk", self._create)
+            app.router.add_put(f"{prefix}/shopping/items", self._update_items)
+            app.router.add_put(f"{prefix}/shopping/items/{{id}}", self._update_item)
+            app.router.add_delete(
+                f"{prefix}/shopping/items/{{id}}", self._delete_item
+            )
+            app.router.add_get(f"{prefix}/mealplans/today", self._empty_list)
+            app.router.add_get(f"{prefix}/mealplans", self._empty_page)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests[f"{request.method} {request.match_info.route.resource}"] += 1
+        await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    async def _about(self, request: web.Request) -> web.Response:
+        return web.json_response({"version": self.version})
+
+    async def _get_lists(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {"items": [{"id": SHOPPING_LIST_ID, "name": "loadtest"}]}
+        )
+
+    async def _get_items(self, request: web.Request) -> web.Response:
+        items = sorted(self.items.values(), key=lambda item: item["position"])
+        if " AND updatedAt >= " in (query := request.query["queryFilter"]):
+            since = query.split(" AND updatedAt >= ")[1].strip('"')
+            items = [item for item in items if item["updatedAt"] >= since]
+        self.items_returned += len(items)
+        return web.json_response({"items": items})
+
+    async def _create_item(self, request: web.Request) -> web.Response:
+        created = [self._add(await request.json())]
+        return web.json_response({"createdItems": created}, status=201)
+
+    async def _create(self, request: web.Request) -> web.Response:
+        created = [self._add(data) for data in await request.json()]
+        return web.json_response({"createdItems": created}, status=201)
+
+    async def _update_items(self, request: web.Request) -> web.Response:
+        updated = [self._update(data) for data in await request.json()]
+        return web.json_response({"updatedItems": [i for i in updated if i]})
+
+    async def _update_item(self, request: web.Request) -> web.Response:
+        data = {**await request.json(), "id": request.match_info["id"]}
+        if (item := self._update(data)) is None:
+            return web.json_response({}, status=404)
+        return web.json_response(item)
+
+    async def _delete_item(self, request: web.Request) -> web.Response:
+        if self.items.pop(request.match_info["id"], None) is None:
+            return web.json_response({}, status=404)
+        return web.json_response({})
+
+    async def _empty_list(self, request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    async def _empty_page(self, request: web.Request) -> web.Response:
+        return web.json_response({"items": []})
+
+
+class User:
+    """A user changing their own items on the shared list."""
+
+    def __init__(self, number: int, entity: MealieTodoListEntity) -> None:
+        """Initialize."""
+        self.number = number
+        self.entity = entity
+        self.item_ids: list[str] = []
+        self.created = 0
+
+    def _item(self, item_id: str) -> dict | None:
+        items = self.entity.coordinator.shopping_list_items[SHOPPING_LIST_ID]
+        return next((item for item in items if item["id"] == item_id), None)
+
+    async def mutate(self, kind: str, expected: dict[str, tuple]) -> None:
+        """Make one change through the entity and record its expected effect."""
+        if kind != "create" and not self.item_ids:
+            kind = "create"
+
+        if kind == "create":
+            self.created += 1
+            summary = f"user-{self.number}-{self.created}"
+            await self.entity.async_create_todo_item(TodoItem(summary=summary))
+            items = self.entity.coordinator.shopping_list_items[SHOPPING_LIST_ID]
+            for item in items:
+                if item["display"] == summary:
+                    self.item_ids.append(item["id"])
+                    expected[item["id"]] = (summary, False)
+            return
+
+        item_id = random.choice(self.item_ids)
+        summary, checked = expected[item_id]
+
+        if kind == "check":
+            status = (
+                TodoItemStatus.NEEDS_ACTION if checked else TodoItemStatus.COMPLETED
+            )
+            await self.entity.async_update_todo_item(
+                TodoItem(uid=item_id, summary=summary, status=status)
+            )
+            expected[item_id] = (summary, not checked)
+        elif kind == "rename":
+            summary = f"{summary}'"
+            status = (
+                TodoItemStatus.COMPLETED if checked else TodoItemStatus.NEEDS_ACTION
+            )
+            await self.entity.async_update_todo_item(
+                TodoItem(uid=item_id, summary=summary, status=status)
+            )
+            expected[item_id] = (summary, checked)
+        elif kind == "move":
+            items = self.entity.coordinator.shopping_list_items[SHOPPING_LIST_ID]
+            previous = random.choice(items)["id"] if items else None
+            if previous != item_id and self._item(item_id) is not None:
+                await self.entity.async_move_todo_item(item_id, previous)
+        elif kind == "delete":
+            await self.entity.async_delete_todo_items([item_id])
+            self.item_ids.remove(item_id)
+            del expected[item_id]
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    """Return a percentile of the values."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+async def run(size: int, users: int, mutations: int, args) -> dict:
+    """Run the workload against a list of size items and return the results."""
+    server = FakeMealie(size, args.latency / 1000, args.server_version)
+    runner = web.AppRunner(server.application())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        domain_config = CONFIG_SCHEMA({DOMAIN: {}})[DOMAIN]
+        hass.data[DOMAIN] = {DOMAIN_CONFIG: domain_config}
+        entry = config_entries.ConfigEntry(
+            version=1,
+            minor_version=1,
+            domain=DOMAIN,
+            title="Mealie",
+            data={CONF_HOST: f"http://127.0.0.1:{port}"},
+            source=config_entries.SOURCE_USER,
+        )
+        config_entries.current_entry.set(entry)
+
+        async with aiohttp.ClientSession() as session:
+            api = MealieApiClient(
+                host=f"http://127.0.0.1:{port}",
+                token="loadtest",
+                session=session,
+                rate_limit=args.rate_limit or domain_config[CONF_RATE_LIMIT],
+                rate_limit_burst=args.burst or domain_config[CONF_RATE_LIMIT_BURST],
+            )
+            await api.async_probe_capabilities()
+            coordinator = MealieDataUpdateCoordinator(hass, api, "loadtest")
+            await coordinator.async_refresh()
+
+            entity = MealieTodoListEntity(
+                coordinator=coordinator,
+                config_entry_id=entry.entry_id,
+                list_id=SHOPPING_LIST_ID,
+                name="loadtest",
+            )
+            entity.hass = hass
+            entity._no_platform_reported = True
+            await entity.async_added_to_hass()
+
+            expected = {
+                item["id"]: (item["display"], item["checked"])
+                for item in coordinator.shopping_list_items[SHOPPING_LIST_ID]
+            }
+            workers = [User(number, entity) for number in range(users)]
+            for position, item_id in enumerate(expected):
+                workers[position % users].item_ids.append(item_id)
+
+            latencies: dict[str, list[float]] = defaultdict(list)
+            server.requests.clear()
+
+            async def _user(user: User) -> None:
+                for _ in range(mutations):
+                    kind = random.choices(
+                        list(MUTATIONS), weights=list(MUTATIONS.values())
+                    )[0]
+                    start = time.perf_counter()
+                    await user.mutate(kind, expected)
+                    latencies[kind].append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(_user(user) for user in workers))
+            elapsed = time.perf_counter() - start
+
+            requests = sum(server.requests.values())
+            writes = sum(
+                count
+                for request, count in server.requests.items()
+                if not request.startswith("GET")
+            )
+
+            await coordinator.get_write_queue(SHOPPING_LIST_ID).async_flush()
+            await coordinator.async_refresh_shopping_list(SHOPPING_LIST_ID)
+
+            server.items_returned = 0
+            await coordinator.async_refresh()
+            items_per_poll = server.items_returned
+
+            server_state = {
+                item["id"]: (item["display"], item["checked"])
+                for item in server.items.values()
+            }
+            entity_state = {
+                item.uid: (item.summary, item.status == TodoItemStatus.COMPLETED)
+                for item in entity.todo_items
+            }
+            positions = Counter(item["position"] for item in server.items.values())
+            unchecked = coordinator.unchecked_item_count(SHOPPING_LIST_ID)
+
+            await entity.async_will_remove_from_hass()
+            await coordinator.async_shutdown()
+            await hass.async_stop(force=True)
+
+    await runner.cleanup()
+
+    total = users * mutations
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "size": size,
+        "mutations": total,
+        "seconds": elapsed,
+        "p50": _percentile(all_latencies, 50),
+        "p99": _percentile(all_latencies, 99),
+        "by_kind": {
+            kind: (_percentile(values, 50), _percentile(values, 99))
+            for kind, values in latencies.items()
+        },
+        "requests_per_mutation": requests / total,
+        "writes_per_mutation": writes / total,
+        "items_per_poll": items_per_poll,
+        "server_matches": server_state == expected,
+        "entity_matches": entity_state == server_state,
+        "lost_items": len(expected.keys() - server_state.keys()),
+        "unexpected_items": len(server_state.keys() - expected.keys()),
+        "changed_items": sum(
+            1
+            for item_id, state in expected.items()
+            if item_id in server_state and server_state[item_id] != state
+        ),
+        "duplicate_positions": sum(count - 1 for count in positions.values()),
+        "counts_match": unchecked
+        == sum(not checked for _, checked in server_state.values()),
+    }
+
+
+def _report(result: dict) -> str:
+    """Return the results of a run as text."""
+    lines = [
+        f"{result['size']:>6} items  {result['mutations']} mutations in "
+        f"{result['seconds']:.1f}s  p50 {result['p50']:.1f}ms  "
+        f"p99 {result['p99']:.1f}ms  "
+        f"{result['requests_per_mutation']:.2f} requests/mutation "
+        f"({result['writes_per_mutation']:.2f} writes)  "
+        f"{result['items_per_poll']} items/poll"
+    ]
+    lines.extend(
+        f"         {kind:<7} p50 {p50:.1f}ms  p99 {p99:.1f}ms"
+        for kind, (p50, p99) in sorted(result["by_kind"].items())
+    )
+    lines.append(
+        f"         server matches users: {result['server_matches']}  "
+        f"entity matches server: {result['entity_matches']}  "
+        f"lost {result['lost_items']}  unexpected {result['unexpected_items']}  "
+        f"changed {result['changed_items']}  "
+        f"duplicate positions {result['duplicate_positions']}  "
+        f"unchecked counts match: {result['counts_match']}"
+    )
+    return "\n".join(lines) + "\n"
+
+
+async def main() -> None:
+    """Run the load test for each list size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--mutations", type=int, default=20, help="per user")
+    parser.add_argument("--latency", type=float, default=5, help="server ms")
+    parser.add_argument("--rate-limit", type=float, help="requests per second")
+    parser.add_argument("--burst", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--server-version", default="v1.12.0", help="reported by the fake server"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    random.seed(args.seed)
+
+    for size in args.sizes:
+        sys.stdout.write(_report(await run(size, args.users, args.mutations, args)))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())